@@ -1,58 +1,107 @@
-
+import hashlib
 import os
+import threading
 import pandas as pd
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 from dotenv import load_dotenv
+from prompts import DEFAULT_TOKEN_BUDGET, IdStreamParser, build_prompt_values
+from response_cache import ResponseCache, cache_key
+
+MODEL = "llama3-70b-8192"
+
+# Define system and human messages for the prompt
+system = """
+You are an expert linguist and also a marketing expert. You will be provided with a list of quotes, one per line,
+in the format id|author|tags|text.
+Your task is to select and recommend engaging quotes from this list based on the user input which specifies the sentiment and other tags.
+The user will also specify the number of desired quotes.
+The user query may be in Spanish, translate precisely to english first in order to make a better selection.
+Answer only with the ids of the selected quotes, most relevant first, separated by commas. Do not write anything else.
+"""
+human = """
+Quotes:
+{quotes}
+
+User input: {user_input}
+Number of quotes desired: {n}
+"""
+
+prompt = ChatPromptTemplate.from_messages([("system", system), ("human", human)])
+
+# Client, chain and response cache are created once per process, on first use
+_chain = None
+_chain_lock = threading.Lock()
+_response_cache = ResponseCache()
+
+
+def get_chain():
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                # Load environment variables from a .env file
+                load_dotenv()
 
-def dame_quotes(user_input, n, df):
-    # Load environment variables from a .env file
-    load_dotenv()
+                # Set up the LLM with ChatGroq (temperature 0: same prompt, same answer, so it can be cached)
+                llm = ChatGroq(
+                    temperature=0,
+                    api_key=os.getenv("GROQ_API_KEY1"),
+                    model=MODEL
+                )
+                _chain = prompt | llm
+    return _chain
 
-    # Get the Groq API key from environment variables
-    api_key = os.getenv("GROQ_API_KEY1")
 
-    # Set up the LLM with ChatGroq
-    llm = ChatGroq(
-        temperature=0,
-        api_key=api_key,
-        model="llama3-70b-8192"
-    )
+def set_response_cache(cache):
+    # E.g. set_response_cache(ResponseCache("recommender_cache.db", ttl=86400)) to keep answers across restarts
+    global _response_cache
+    _response_cache = cache
 
-   
 
-    # Define system and human messages for the prompt
-    system = """
-    You are an expert linguist and also a marketing expert. You will be provided with a list of quotes in the form of a pandas DataFrame, named df
-    Your task is to select and recommend engaging quotes from this list based on the user input which specifies the sentiment and other tags.
-    The user will also specify the number of desired quotes.
-    The use query may be in Spanish, translate precisely to english first in order to make a better selection.
-    select only the relevant quotes, include the author in each quote, and do not explain further, just enumerate the quotes in your response, without any heading.
-    Never show the tags in the quote, do not start with "here are some quotes" or "here is a quote "
+def candidates_version(quotes):
+    # Digest of the serialized candidates: the answer is reused only if the model would see the same quotes
+    return hashlib.sha256(quotes.encode("utf-8")).hexdigest()[:16]
 
-    """
-    human = """
-    Here is the DataFrame with quotes:
-    {df}
 
-    User input: {user_input}
-    Number of quotes desired: {n}
-    """
+def stream_quotes(user_input, n, df, token_budget=DEFAULT_TOKEN_BUDGET, llm=None, cache=None, corpus_version=None):
+    # Generator: yields each selected quote (a dict with the columns of df) as soon as the model
+    # has finished writing its id, using the chain's .stream(). Stops after n quotes.
+    # df: candidate quotes (text, tags, author), most relevant first.
+    # llm: chat model to use instead of the shared ChatGroq client (tests).
+    # corpus_version: part of the cache key; by default a digest of the candidates sent to the model.
+    llm_chain = get_chain() if llm is None else prompt | llm
+    cache = _response_cache if cache is None else cache
+    model = MODEL if llm is None else getattr(llm, "model_name", type(llm).__name__)
 
-    prompt = ChatPromptTemplate.from_messages([("system", system), ("human", human)])
+    # Compact id|author|tags|text lines that fit in the token budget
+    user_prompt, ids = build_prompt_values([system, human], user_input, n, df.to_dict("records"), token_budget)
 
-    # Create a query engine
-    llm_chain = prompt | llm
+    key = cache_key(user_input, n, model, corpus_version or candidates_version(user_prompt["quotes"]))
+    records = cache.get(key)
+    if records is not None:
+        yield from records
+        return
 
-    # Prepare the input for the LLM as a dictionary
-    user_prompt = {
-        "df": df.to_string(index=False),
-        "user_input": user_input,
-        "n": n
-    }
+    # Stream the response from the LLM (just the ids) and rebuild each full quote locally
+    records = []
+    parser = IdStreamParser(ids, n)
+    for chunk in llm_chain.stream(user_prompt):
+        for quote_id in parser.feed(chunk.content):
+            records.append(df.iloc[[quote_id - 1]].to_dict("records")[0])
+            yield records[-1]
+        if parser.done:
+            break
+    for quote_id in parser.close():
+        records.append(df.iloc[[quote_id - 1]].to_dict("records")[0])
+        yield records[-1]
 
-    # Get the response from the LLM
-    response = llm_chain.invoke(user_prompt)
+    # Only complete answers are cached (not empty ones or a stream abandoned by the caller)
+    if records:
+        cache.set(key, records)
 
 
-    return response.content
+def dame_quotes(user_input, n, df, token_budget=DEFAULT_TOKEN_BUDGET, llm=None, cache=None, corpus_version=None):
+    # Returns the selected rows of df, in the order chosen by the model
+    records = stream_quotes(user_input, n, df, token_budget, llm, cache, corpus_version)
+    return pd.DataFrame(list(records), columns=df.columns)
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import nullcontext
+from urllib.parse import urlparse
+import aiohttp
+import pandas as pd
+from oop_scraper import get_logger
+from author_cache import AuthorCache
+from pipeline import run_pipeline_async
+from extractors import get_extractor
+from parse_pool import ParsePool
+from checkpoint import CrawlState
+from rate_limiter import RateLimiter, RetryPolicy, parse_retry_after
+from metrics import MetricsRegistry
+
+
+class AsyncQuoteCrawler:
+    def __init__(self, start_url, max_concurrency=20, max_per_host=10, keepalive_timeout=30, timeout=(5, 30),
+                 author_cache=None, http_cache=None, max_pending_pages=4,
+                 extractor=None, parse_workers=0, parse_pool=None, rate_limiter=None, retry_policy=None,
+                 request_slot=None, metrics=None):
+        self.start_url = start_url
+        self.author_cache = author_cache or AuthorCache()
+        self.http_cache = http_cache
+        self.extractor = get_extractor(extractor)
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.keepalive_timeout = keepalive_timeout
+        # timeout: segundos totales o (conexión, lectura)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Hueco de concurrencia externo (p. ej. el límite global de CrawlScheduler) por petición
+        self.request_slot = request_slot or (lambda url: nullcontext())
+        self.max_pending_pages = max_pending_pages
+        # parse_workers > 0: el parseo se hace en un ProcessPoolExecutor en lugar del bucle de eventos.
+        # parse_pool: pool externo compartido (CrawlScheduler); lo cierra quien lo creó
+        self.parse_workers = parse_workers
+        self.parse_pool = parse_pool
+        self.metrics = metrics or MetricsRegistry()
+        self.logger = get_logger()
+
+    def run(self):
+        return asyncio.run(self.crawl())
+
+    def run_pipeline(self, sink, batch_size=500, state=None):
+        return asyncio.run(run_pipeline_async(self.iter_quotes(state), sink, batch_size))
+
+    async def crawl(self):
+        quotes_data = [quote async for quote in self.iter_quotes()]
+        return pd.DataFrame(quotes_data, columns=["text", "author", "tags", "about_author"])
+
+    async def iter_quotes(self, state=None):
+        state = state or CrawlState([self.start_url])
+        for author_url, about_author in state.authors.items():
+            self.author_cache.set(author_url, about_author)
+
+        # Un único pool de conexiones (keep-alive) para todas las peticiones del crawl
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        if isinstance(self.timeout, tuple):
+            client_timeout = aiohttp.ClientTimeout(connect=self.timeout[0], sock_read=self.timeout[1])
+        else:
+            client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        own_pool = self.parse_pool is None and self.parse_workers
+        if own_pool:
+            self.parse_pool = ParsePool(self.parse_workers, self.extractor.name)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            # Páginas cuyos autores aún se están descargando. Se acota para que la memoria no crezca
+            # con el tamaño del sitio: las citas salen en orden en cuanto su página está completa.
+            pending = deque()
+            frontier = state.pending()
+            next_url = frontier[0] if frontier else None
+            try:
+                # Las páginas de listado son secuenciales (el enlace "next" está en cada página),
+                # pero las páginas de autor se descargan en paralelo mientras avanzamos.
+                try:
+                    while next_url and next_url not in state.visited:
+                        page_url = next_url
+                        html, changed = await self.fetch(session, page_url, defer=True)
+
+                        # Página sin cambios: solo necesitamos el enlace a la siguiente
+                        cached_next = self.http_cache.get_next_url(page_url) if not changed else None
+                        if cached_next is not None:
+                            next_url = cached_next or None
+                            quotes = []
+                        else:
+                            quotes, next_url = await self.parse_quote_page(html, page_url)
+                            if self.http_cache is not None:
+                                self.http_cache.set_next_url(page_url, next_url)
+                            if not changed:
+                                quotes = []
+
+                        author_urls = [quote.pop("author_url") for quote in quotes]
+                        author_tasks = [
+                            asyncio.create_task(self.author_cache.get_or_fetch_async(
+                                author_url, lambda url: self.scrape_author(session, url)
+                            ))
+                            for author_url in author_urls
+                        ]
+                        # Las páginas se completan en orden, así las visitadas son siempre un prefijo del crawl
+                        pending.append((page_url, next_url, quotes, author_urls, asyncio.gather(*author_tasks)))
+
+                        async for quote in self._drain(pending, state, self.max_pending_pages):
+                            yield quote
+                except Exception:
+                    # Antes de propagar el error se entregan las páginas que ya estaban descargadas
+                    async for quote in self._drain(pending, state):
+                        yield quote
+                    raise
+
+                async for quote in self._drain(pending, state):
+                    yield quote
+            finally:
+                for *_, authors in pending:
+                    authors.cancel()
+                if own_pool:
+                    self.parse_pool.close()
+                    self.parse_pool = None
+
+    async def _drain(self, pending, state, keep=0):
+        while len(pending) > keep:
+            page = pending.popleft()
+            for quote in await self._complete_page(page, state):
+                yield quote
+            state.finish_page(page[0], page[1])
+
+    async def _complete_page(self, page, state):
+        page_url, _, quotes, author_urls, authors = page
+        state.start_page(page_url)
+        for quote, author_url, about_author in zip(quotes, author_urls, await authors):
+            state.add_author(author_url, about_author)
+            quote["about_author"] = about_author
+        return quotes
+
+    async def scrape_author(self, session, author_url):
+        html, _ = await self.fetch(session, author_url)
+        # Con pool de procesos se mide el tiempo hasta tener el resultado (incluye el IPC)
+        with self.metrics.timer("scraper_parse_seconds", kind="author"):
+            if self.parse_pool is None:
+                return self.extractor.parse_author_page(html)
+            return (await self.parse_pool.parse_author_async(author_url, html, self.extractor.name))["about_author"]
+
+    async def parse_quote_page(self, html, page_url):
+        with self.metrics.timer("scraper_parse_seconds", kind="listing"):
+            if self.parse_pool is None:
+                return self.extractor.parse_quote_page(html, page_url)
+            result = await self.parse_pool.parse_listing_async(page_url, html, self.extractor.name)
+        return result["quotes"], result["next_url"]
+
+    async def fetch(self, session, url, defer=False):
+        headers = self.http_cache.conditional_headers(url) if self.http_cache is not None else None
+        status, html, response_headers = await self.request(session, url, headers)
+
+        if self.http_cache is None:
+            return html, True
+        return self.http_cache.resolve(url, status, response_headers, html, defer=defer)
+
+    async def request(self, session, url, headers=None):
+        attempt = 0
+        while True:
+            async with self.rate_limiter.acquire_async(url), self.request_slot(url):
+                start = time.monotonic()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        status, response_headers = response.status, response.headers
+                        body = await response.read()
+                        html = await response.text()
+                    error = None
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    status, body, html, response_headers, error = None, b"", None, None, e
+                latency = time.monotonic() - start
+
+            self.metrics.record_request(urlparse(url).netloc, status, latency, len(body))
+            retry_after = parse_retry_after(response_headers.get("Retry-After")) if response_headers is not None and \
+                status in self.retry_policy.retry_statuses else None
+            self.rate_limiter.record(url, status, latency, retry_after)
+
+            if self.retry_policy.should_retry(status, attempt):
+                delay = self.retry_policy.delay(attempt, retry_after)
+                self.logger.warning(f"Reintentando {url} en {delay:.2f}s (estado: {status or error!r})")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if error is not None:
+                raise error
+            if status >= 400:
+                raise aiohttp.ClientResponseError(None, (), status=status, message=f"HTTP {status} en {url}")
+            return status, html, response_headers
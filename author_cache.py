@@ -0,0 +1,105 @@
+import asyncio
+import sqlite3
+import threading
+
+
+class AuthorCache:
+    # Caché de biografías de autor por URL. Solo memoria por defecto; con db_path se persiste en SQLite.
+    # La conexión se abre al primer uso y close() la libera (un uso posterior la vuelve a abrir)
+    def __init__(self, db_path=None):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._memory = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        # Se llama con self._lock adquirido
+        if self._conn is None and self.db_path:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS author_cache (url TEXT PRIMARY KEY, about_author TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url):
+        with self._lock:
+            if url in self._memory:
+                return self._memory[url]
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute("SELECT about_author FROM author_cache WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._memory[url] = row[0]
+            return row[0]
+
+    def set(self, url, about_author):
+        with self._lock:
+            self._memory[url] = about_author
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO author_cache (url, about_author) VALUES (?, ?)", (url, about_author)
+                )
+                conn.commit()
+
+    def get_or_fetch(self, url, fetch):
+        about_author = self.get(url)
+        if about_author is not None:
+            self.hits += 1
+            return about_author
+
+        self.misses += 1
+        about_author = fetch(url)
+        self.set(url, about_author)
+        return about_author
+
+    async def get_or_fetch_async(self, url, fetch):
+        about_author = self.get(url)
+        if about_author is not None:
+            self.hits += 1
+            return about_author
+
+        # Si ya hay una descarga en curso para esta URL, esperamos su resultado en lugar de repetirla
+        future = self._inflight.get(url)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            about_author = await fetch(url)
+        except Exception as e:
+            future.set_exception(e)
+            # Evita el aviso de "exception never retrieved" si nadie más estaba esperando
+            future.exception()
+            raise
+        else:
+            self.set(url, about_author)
+            future.set_result(about_author)
+            return about_author
+        finally:
+            del self._inflight[url]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "size": len(self._memory)}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,132 @@
+# Crawl completo de QuoteScraper contra el servidor sintético de tests/fixture_server.py:
+# páginas/s, citas/s, tiempo de parseo, tiempo de escritura en BBDD y memoria pico.
+# El servidor corre en este proceso y cada crawl en un subproceso, para que el RSS pico sea solo del scraper.
+#
+#   python benchmarks/bench_crawl.py --pages 200 --quotes-per-page 10 --authors 50 --delay 0.01 --modes sync async
+#   python benchmarks/bench_crawl.py --min-pages-per-sec 50    # sale con código 1 si algún modo no llega
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from fixture_server import FixtureServer, QuotesSite
+
+
+class TimedExtractor:
+    # Envuelve el extractor del scraper y acumula el tiempo de parseo
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.name = extractor.name
+        self.seconds = 0.0
+
+    def parse_quote_page(self, html, base_url):
+        start = time.perf_counter()
+        try:
+            return self.extractor.parse_quote_page(html, base_url)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def parse_author_page(self, html):
+        start = time.perf_counter()
+        try:
+            return self.extractor.parse_author_page(html)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def peak_rss_mb():
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def crawl(url, mode, extractor, batch_size):
+    from oop_scraper import QuoteScraper
+    from rate_limiter import RateLimiter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Sin límite de tasa efectivo: se mide el scraper, no la política de cortesía
+        limiter = RateLimiter(rate=1e6, max_rate=1e6, burst=1000, concurrency=64, max_concurrency=64)
+        scraper = QuoteScraper(url, db_name=os.path.join(tmp, "quotes.db"), extractor=extractor,
+                               rate_limiter=limiter)
+        scraper.extractor = TimedExtractor(scraper.extractor)
+
+        store_records = scraper.store_records
+        db = {"seconds": 0.0}
+
+        def timed_store(records):
+            start = time.perf_counter()
+            try:
+                return store_records(records)
+            finally:
+                db["seconds"] += time.perf_counter() - start
+
+        scraper.store_records = timed_store
+        start = time.perf_counter()
+        counts = scraper.run_pipeline(concurrent=mode == "async", batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        scraper.engine.dispose()
+
+    return {
+        "elapsed": elapsed,
+        "quotes": sum(counts.values()),
+        "parse": scraper.extractor.seconds,
+        "db": db["seconds"],
+        "rss": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--filler-words", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.0, help="latencia fija del servidor (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latencia aleatoria añadida (s)")
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--extractor", default="soup")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--min-pages-per-sec", type=float, default=0.0)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        url, mode = args.child
+        print(json.dumps(crawl(url, mode, args.extractor, args.batch_size)))
+        return
+
+    site = QuotesSite(args.pages, args.quotes_per_page, args.authors, args.filler_words)
+    print(f"{'modo':>6} {'páginas/s':>10} {'citas/s':>9} {'total (s)':>10} {'parseo (s)':>11} "
+          f"{'BBDD (s)':>9} {'RSS pico (MB)':>14}")
+    slow = []
+    with FixtureServer(site, delay=args.delay, jitter=args.jitter) as server:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", server.url, mode,
+                 "--extractor", args.extractor, "--batch-size", str(args.batch_size)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            pages_per_sec = args.pages / result["elapsed"]
+            print(f"{mode:>6} {pages_per_sec:>10.1f} {result['quotes'] / result['elapsed']:>9.1f} "
+                  f"{result['elapsed']:>10.3f} {result['parse']:>11.3f} {result['db']:>9.3f} {result['rss']:>14.1f}")
+            if pages_per_sec < args.min_pages_per_sec:
+                slow.append(mode)
+
+    if slow:
+        print(f"Por debajo de {args.min_pages_per_sec} páginas/s: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
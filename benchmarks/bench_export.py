@@ -0,0 +1,89 @@
+# Tiempo y memoria pico de cada formato de exportación, escribiendo por lotes como hace run_pipeline.
+# Cada medición corre en un subproceso para que el pico de memoria (ru_maxrss) sea solo suyo.
+#
+#   python benchmarks/bench_export.py --rows 10000 100000 1000000 --formats csv jsonl parquet excel
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from exporters import EXPORTERS, get_exporter
+from pipeline import batched
+
+
+def iter_quotes(n):
+    for i in range(n):
+        yield {
+            "text": f"Quote number {i}: the world as we have created it is a process of our thinking.",
+            "author": f"Author {i % 500}",
+            "tags": f"tag{i % 7}, tag{i % 11}",
+            "about_author": f"Biography of author {i % 500}. " * 5,
+        }
+
+
+def export(fmt, rows, path, batch_size):
+    if fmt == "legacy-excel":
+        # Ruta original: DataFrame completo en memoria y to_excel al final
+        import pandas as pd
+
+        pd.DataFrame(list(iter_quotes(rows))).to_excel(path, index=False)
+        return
+    with get_exporter(fmt, path) as exporter:
+        for batch in batched(iter_quotes(rows), batch_size):
+            exporter.write(batch)
+
+
+def peak_rss_mb():
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(fmt, rows, batch_size):
+    extension = ".xlsx" if fmt == "legacy-excel" else EXPORTERS[fmt].extension
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"quotes{extension}")
+        start = time.perf_counter()
+        export(fmt, rows, path, batch_size)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    print(f"{elapsed:.3f} {peak_rss_mb():.1f} {size}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", default=["csv", "jsonl", "parquet", "excel", "legacy-excel"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--excel-max-rows", type=int, default=100_000,
+                        help="Excel es muy lento con muchos datos; por encima de este tamaño se omite")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_one(args.child[0], int(args.child[1]), args.batch_size)
+        return
+
+    print(f"{'formato':>13} {'citas':>9} {'tiempo (s)':>11} {'RSS pico (MB)':>14} {'tamaño (MB)':>12}")
+    for rows in args.rows:
+        for fmt in args.formats:
+            if "excel" in fmt and rows > args.excel_max_rows:
+                print(f"{fmt:>13} {rows:>9} {'omitido':>11}")
+                continue
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", fmt, str(rows), "--batch-size", str(args.batch_size)],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            elapsed, peak, size = float(output[0]), float(output[1]), int(output[2])
+            print(f"{fmt:>13} {rows:>9} {elapsed:>11.3f} {peak:>14.1f} {size / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Páginas por segundo de cada backend de extracción sobre las páginas guardadas en tests/fixtures
+#
+#   python benchmarks/bench_extractors.py --iterations 500
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extractors import EXTRACTORS, get_extractor
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def bench(extractor, pages, authors, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for html in pages:
+            extractor.parse_quote_page(html, "http://quotes.toscrape.com/")
+        for html in authors:
+            extractor.parse_author_page(html)
+    elapsed = time.perf_counter() - start
+    return iterations * (len(pages) + len(authors)) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = [read_fixture("quotes_page.html"), read_fixture("quotes_last_page.html")]
+    authors = [read_fixture("author_page.html")]
+
+    results = {name: bench(get_extractor(name), pages, authors, args.iterations) for name in EXTRACTORS}
+    reference = results["soup"]
+    for name, pages_per_second in results.items():
+        print(f"{name:10s} {pages_per_second:10.0f} pages/s  x{pages_per_second / reference:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Tiempo de importación en frío de gui_scraper (o de otro módulo) a partir de `python -X importtime`.
+# Lista las importaciones más costosas y comprueba que los módulos pesados no se cargan al arrancar.
+#
+#   python benchmarks/bench_import.py --module gui_scraper --repeat 5 --budget 2.0
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# No deberían cargarse hasta que se usa la opción correspondiente de la GUI
+HEAVY_MODULES = ("langchain_core", "langchain_groq", "groq", "autogen", "bs4", "requests", "aiohttp",
+                 "sqlalchemy", "pandas", "oop_scraper", "ai_recommender", "autogen_agents")
+
+
+class ImportProfile:
+    def __init__(self, module, entries):
+        self.module = module
+        # nombre -> (self, acumulado, profundidad), tiempos en segundos
+        self.modules = entries
+        self.total = entries[module][1] if module in entries else sum(
+            cumulative for _, cumulative, depth in entries.values() if depth == 0)
+
+    def heaviest(self, count=15, max_depth=1):
+        candidates = [(name, cumulative) for name, (_, cumulative, depth) in self.modules.items()
+                      if depth <= max_depth and name != self.module]
+        return sorted(candidates, key=lambda item: item[1], reverse=True)[:count]
+
+
+def import_profile(module, python=sys.executable):
+    # Proceso nuevo para medir un arranque en frío (sin módulos ya cargados)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=ROOT, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    entries = {}
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        name = name.strip()
+        if name not in entries:
+            entries[name] = (int(self_us) / 1e6, int(cumulative_us) / 1e6, depth)
+    return ImportProfile(module, entries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="gui_scraper")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=None, help="segundos; sale con código 1 si se supera")
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.repeat)]
+    best = min(profiles, key=lambda profile: profile.total)
+    print(f"{args.module}: {best.total * 1000:.0f} ms (mejor de {args.repeat}), "
+          f"mediana {sorted(p.total for p in profiles)[len(profiles) // 2] * 1000:.0f} ms")
+    print("\nImportaciones más costosas:")
+    for name, cumulative in best.heaviest(args.top):
+        print(f"  {cumulative * 1000:8.1f} ms  {name}")
+
+    loaded = [name for name in HEAVY_MODULES if name in best.modules]
+    print(f"\nMódulos pesados cargados al arrancar: {', '.join(loaded) or 'ninguno'}")
+
+    if args.budget is not None and best.total > args.budget:
+        print(f"Por encima del presupuesto de {args.budget:.2f} s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Coste de preparar el prompt del recomendador según crece la tabla: tabla completa (ruta original)
+# frente a la preselección BM25 de retrieval.top_k_candidates. Mide latencia y tamaño del prompt.
+# Caso peor: con un vocabulario de 20 palabras casi todas las citas coinciden con la consulta.
+#
+#   python benchmarks/bench_retrieval.py --rows 1000 10000 100000
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oop_scraper import QuoteScraper
+from queries import read_frame
+from retrieval import shortlist_size, top_k_candidates
+
+WORDS = ("love life hope courage fear dream friendship truth wisdom time change success failure "
+         "happiness sadness freedom beauty art music silence").split()
+QUERIES = ("quotes about love and hope", "frases sobre el éxito y el fracaso (success failure)",
+           "courage in times of fear", "friendship")
+
+
+def make_records(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        words = rng.sample(WORDS, 4)
+        yield {
+            "text": f"Quote {i}: {' and '.join(words[:2])} are the measure of {words[2]}.",
+            "author": f"Author {i % 500}",
+            "tags": ", ".join(words[2:]),
+            "about_author": f"Biography of author {i % 500}.",
+        }
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--n", type=int, default=5, help="Número de frases pedidas")
+    args = parser.parse_args()
+
+    k = shortlist_size(args.n)
+    print(f"{'citas':>9} {'tabla (ms)':>11} {'prompt tabla':>13} {'top-k (ms)':>11} {'prompt top-k':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = QuoteScraper("http://localhost/", db_name=os.path.join(tmp, "quotes.db"))
+            scraper.store_records(list(make_records(rows)))
+
+            full_time, full = timed(read_frame, scraper.engine, text("SELECT text, tags, author FROM quotes"))
+            full_time += timed(full.to_string, index=False)[0]
+            full_chars = len(full.to_string(index=False))
+
+            latencies, chars = [], []
+            for query in QUERIES:
+                elapsed, candidates = timed(top_k_candidates, scraper.engine, query, k)
+                latencies.append(elapsed + timed(candidates.to_string, index=False)[0])
+                chars.append(len(candidates[["text", "tags", "author"]].to_string(index=False)))
+            scraper.engine.dispose()
+
+        print(f"{rows:>9} {full_time * 1000:>11.1f} {full_chars:>13} "
+              f"{statistics.median(latencies) * 1000:>11.1f} {max(chars):>13}")
+
+
+if __name__ == "__main__":
+    main()
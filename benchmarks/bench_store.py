@@ -0,0 +1,122 @@
+# Compara el almacenamiento fila a fila original (biografía repetida en cada cita) con el upsert
+# por lotes de QuoteScraper.store_data (biografía una vez por autor): tiempo, tamaño y lectura completa
+#
+#   python benchmarks/bench_store.py --rows 200000
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from sqlalchemy import create_engine, text, Column, Integer, String, Text
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oop_scraper import QuoteScraper
+
+LegacyBase = declarative_base()
+
+
+class LegacyQuote(LegacyBase):
+    # Esquema original de la tabla quotes
+    __tablename__ = "quotes"
+
+    id = Column(Integer, primary_key=True)
+    text = Column(Text)
+    author = Column(String(100))
+    tags = Column(String(200))
+    about_author = Column(Text)
+
+
+def make_quotes(n):
+    return pd.DataFrame({
+        "text": [f"Quote number {i}" for i in range(n)],
+        "author": [f"Author {i % 500}" for i in range(n)],
+        "tags": [f"tag{i % 7}, tag{i % 11}" for i in range(n)],
+        "about_author": [f"Biography of author {i % 500}. " * 20 for i in range(n)],
+    })
+
+
+@contextmanager
+def sql_log_to_devnull():
+    # Con un handler ya instalado SQLAlchemy no añade el suyo (stdout): el log de echo=True se formatea
+    # igual que en la ruta original, pero se escribe en os.devnull en lugar de inundar la salida
+    logger = logging.getLogger("sqlalchemy.engine.Engine")
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        try:
+            yield
+        finally:
+            logger.removeHandler(handler)
+
+
+def legacy_store(db_path, df):
+    # Ruta original: echo=True, sin PRAGMAs, un session.add por fila
+    with sql_log_to_devnull():
+        engine = create_engine(f"sqlite:///{db_path}", echo=True)
+        LegacyBase.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        for _, row in df.iterrows():
+            session.add(LegacyQuote(text=row["text"], author=row["author"], tags=row["tags"],
+                                    about_author=row["about_author"]))
+        session.commit()
+        session.close()
+        engine.dispose()
+
+
+def bulk_store(db_path, df):
+    scraper = QuoteScraper("http://localhost/", db_name=db_path)
+    result = scraper.store_data(df)
+    scraper.engine.dispose()
+    return result
+
+
+def read_all(db_path, table, columns="id, text, author, tags, about_author"):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT {columns} FROM {table}")).fetchall()
+    engine.dispose()
+    return len(rows)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = make_quotes(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_time, _ = timed(legacy_store, os.path.join(tmp, "legacy.db"), df)
+        bulk_time, result = timed(bulk_store, os.path.join(tmp, "bulk.db"), df)
+        rerun_time, rerun = timed(bulk_store, os.path.join(tmp, "bulk.db"), df)
+        legacy_read, _ = timed(read_all, os.path.join(tmp, "legacy.db"), "quotes")
+        bulk_read, _ = timed(read_all, os.path.join(tmp, "bulk.db"), "quotes_flat")
+        # Sin biografía (navegador de la GUI sin esa columna, recuentos): tabla quotes, sin JOIN
+        bare_read, _ = timed(read_all, os.path.join(tmp, "bulk.db"), "quotes", "id, text, author, tags")
+        legacy_size = os.path.getsize(os.path.join(tmp, "legacy.db")) / 1e6
+        bulk_size = os.path.getsize(os.path.join(tmp, "bulk.db")) / 1e6
+
+    print(f"rows: {args.rows}")
+    print(f"legacy (iterrows + session.add): {legacy_time:8.2f} s  {args.rows / legacy_time:10.0f} rows/s")
+    print(f"bulk upsert (first load):        {bulk_time:8.2f} s  {args.rows / bulk_time:10.0f} rows/s  {result}")
+    print(f"bulk upsert (re-run, no change): {rerun_time:8.2f} s  {args.rows / rerun_time:10.0f} rows/s  {rerun}")
+    print(f"DB size: legacy {legacy_size:.1f} MB, authors table {bulk_size:.1f} MB")
+    print(f"full read: legacy {legacy_read:.2f} s, quotes_flat view {bulk_read:.2f} s, "
+          f"quotes without biography {bare_read:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Índice vectorial (vectors.VectorIndex): velocidad del embedder y latencia de búsqueda top-k
+# con búsqueda exacta (todas las filas) y con clusters (IVF), más el recall del IVF frente a la exacta.
+# Los vectores de la prueba de latencia son sintéticos (mezcla de gaussianas) para no tener que
+# embeber un millón de textos.
+#
+#   python benchmarks/bench_vectors.py --rows 100000 1000000
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vectors import HashingEmbedder, VectorIndex, _normalize_rows
+
+
+def synthetic_vectors(rows, dim, topics=2000, seed=0, batch=100_000):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    for start in range(0, rows, batch):
+        size = min(batch, rows - start)
+        noise = rng.standard_normal((size, dim)).astype(np.float32)
+        yield _normalize_rows(centers[rng.integers(0, topics, size)] + 0.8 * noise)
+
+
+def latency(index, queries, k):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query[None, :], k)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--nprobe", type=int, default=32)
+    parser.add_argument("--embed-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(dim=args.dim)
+    texts = [f"Quote {i}: love and hope are the measure of courage in times of sadness" for i in range(args.embed_rows)]
+    start = time.perf_counter()
+    embedder.embed(texts)
+    print(f"embedder: {args.embed_rows / (time.perf_counter() - start):.0f} textos/s")
+
+    print(f"{'vectores':>9} {'exacta (ms)':>12} {'IVF (ms)':>9} {'recall@k':>9} {'clusters (s)':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = VectorIndex(tmp, embedder=HashingEmbedder(dim=args.dim), cluster_threshold=0,
+                                nprobe=args.nprobe)
+            next_id = 1
+            for vectors in synthetic_vectors(rows, args.dim):
+                index.add_vectors(np.arange(next_id, next_id + len(vectors)), vectors)
+                next_id += len(vectors)
+            queries = next(synthetic_vectors(args.queries, args.dim, seed=1))
+
+            exact_ms = latency(index, queries, args.k)
+            exact_ids, _ = index.search(queries, args.k)
+
+            start = time.perf_counter()
+            index.build_clusters()
+            build_s = time.perf_counter() - start
+            ivf_ms = latency(index, queries, args.k)
+            ivf_ids, _ = index.search(queries, args.k)
+            recall = np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(exact_ids, ivf_ids)])
+            index.close()
+
+        print(f"{rows:>9} {exact_ms:>12.1f} {ivf_ms:>9.1f} {recall:>9.2f} {build_s:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import json
+import sqlite3
+
+
+class CrawlState:
+    # Estado reanudable de un crawl: páginas pendientes, páginas completadas y autores ya descargados
+    def __init__(self, frontier=None, visited=None, authors=None):
+        self.frontier = list(frontier or [])
+        self.visited = set(visited or [])
+        self.authors = dict(authors or {})
+        self.current = None
+        self.pages_since_save = 0
+        self._new_visited = []
+        self._new_authors = {}
+
+    def add_author(self, url, about_author):
+        if url not in self.authors:
+            self.authors[url] = about_author
+            self._new_authors[url] = about_author
+
+    def start_page(self, url):
+        self.current = url
+
+    def finish_page(self, url, next_url):
+        # La página solo cuenta como visitada cuando todas sus citas ya se han entregado
+        self.visited.add(url)
+        self._new_visited.append(url)
+        self.current = None
+        self.frontier = [next_url] if next_url else []
+        self.pages_since_save += 1
+
+    def pending(self):
+        # Si una página quedó a medias se vuelve a empezar por ella (el upsert hace idempotente repetirla)
+        return [self.current] if self.current else list(self.frontier)
+
+
+class CrawlCheckpoint:
+    def __init__(self, db_path, crawl_id):
+        self.crawl_id = crawl_id
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+                crawl_id TEXT PRIMARY KEY,
+                frontier TEXT NOT NULL,
+                finished INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS crawl_visited (
+                crawl_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (crawl_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_authors (
+                crawl_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                about_author TEXT NOT NULL,
+                PRIMARY KEY (crawl_id, url)
+            );
+            -- Citas ya exportadas por el crawl en curso (hash de contenido): al reanudar no se repiten
+            CREATE TABLE IF NOT EXISTS crawl_exported (
+                crawl_id TEXT NOT NULL,
+                content_hash BLOB NOT NULL,
+                PRIMARY KEY (crawl_id, content_hash)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def load(self):
+        # Devuelve el CrawlState de un crawl sin terminar, o None si no hay nada que reanudar
+        row = self._conn.execute(
+            "SELECT frontier, finished FROM crawl_checkpoints WHERE crawl_id = ?", (self.crawl_id,)
+        ).fetchone()
+        if row is None or row[1]:
+            return None
+
+        visited = [url for (url,) in self._conn.execute(
+            "SELECT url FROM crawl_visited WHERE crawl_id = ?", (self.crawl_id,))]
+        authors = dict(self._conn.execute(
+            "SELECT url, about_author FROM crawl_authors WHERE crawl_id = ?", (self.crawl_id,)))
+        return CrawlState(json.loads(row[0]), visited, authors)
+
+    def save(self, state, finished=False):
+        with self._conn:
+            self._conn.execute(
+                """INSERT INTO crawl_checkpoints (crawl_id, frontier, finished) VALUES (?, ?, ?)
+                   ON CONFLICT(crawl_id) DO UPDATE SET frontier = excluded.frontier, finished = excluded.finished""",
+                (self.crawl_id, json.dumps(state.pending()), int(finished)),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_visited (crawl_id, url) VALUES (?, ?)",
+                [(self.crawl_id, url) for url in state._new_visited],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_authors (crawl_id, url, about_author) VALUES (?, ?, ?)",
+                [(self.crawl_id, url, about_author) for url, about_author in state._new_authors.items()],
+            )
+        # Solo se escriben las novedades desde el último guardado
+        state._new_visited = []
+        state._new_authors = {}
+        state.pages_since_save = 0
+
+    def exported(self, hashes):
+        # Subconjunto de `hashes` ya exportado en este crawl (consultas por bloques, sin cargar la tabla)
+        hashes = list(hashes)
+        found = set()
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            found.update(content_hash for (content_hash,) in self._conn.execute(
+                f"SELECT content_hash FROM crawl_exported WHERE crawl_id = ? "
+                f"AND content_hash IN ({', '.join('?' * len(chunk))})", (self.crawl_id, *chunk)))
+        return found
+
+    def add_exported(self, hashes):
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO crawl_exported (crawl_id, content_hash) VALUES (?, ?)",
+                                   [(self.crawl_id, content_hash) for content_hash in hashes])
+
+    def clear(self):
+        with self._conn:
+            for table in ("crawl_checkpoints", "crawl_visited", "crawl_authors", "crawl_exported"):
+                self._conn.execute(f"DELETE FROM {table} WHERE crawl_id = ?", (self.crawl_id,))
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,76 @@
+import os
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# PRAGMAs aplicados a cada conexión SQLite nueva
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # en KiB (negativo): ~64 MB de caché de páginas
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+# Pool de conexiones por engine: conexiones reutilizadas entre peticiones/hilos en lugar de abrir una por operación
+POOL_SETTINGS = {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": 3600}
+
+_databases = {}
+_lock = threading.Lock()
+
+
+def create_sqlite_engine(db_path, echo=False, pragmas=None, **pool_settings):
+    engine = create_engine(f'sqlite:///{db_path}', echo=echo, **{**POOL_SETTINGS, **pool_settings})
+    settings = DEFAULT_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+class Database:
+    # Engine y fábrica de sesiones de un fichero SQLite. Cada `setup` (esquema y migraciones) se ejecuta
+    # una sola vez por engine, aunque llegue en una llamada posterior a get_database
+    def __init__(self, db_path, echo=False, pragmas=None, setup=None):
+        self.path = db_path
+        self.engine = create_sqlite_engine(db_path, echo=echo, pragmas=pragmas)
+        self._setups = set()
+        self.apply_setup(setup)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def apply_setup(self, setup):
+        if setup is not None and setup not in self._setups:
+            setup(self.engine)
+            self._setups.add(setup)
+
+    def dispose(self):
+        self.engine.dispose()
+
+
+def get_database(db_path, echo=False, pragmas=None, setup=None):
+    # Un único Database por fichero y configuración, compartido por el scraper y la GUI.
+    # Si el fichero ha desaparecido (BBDD borrada a mano) se vuelve a crear con su esquema.
+    db_path = os.path.abspath(db_path)
+    key = (db_path, echo, None if pragmas is None else tuple(sorted(pragmas.items())))
+    with _lock:
+        database = _databases.get(key)
+        if database is None or not os.path.exists(db_path):
+            if database is not None:
+                database.dispose()
+            database = _databases[key] = Database(db_path, echo, pragmas, setup)
+        else:
+            database.apply_setup(setup)
+        return database
+
+
+def dispose_databases():
+    with _lock:
+        for database in _databases.values():
+            database.dispose()
+        _databases.clear()
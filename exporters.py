@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+
+# Exportadores en streaming: se abren una vez, reciben las citas por lotes con write(records) y se cierran
+# al final, sin necesidad de tener todo el dataset en memoria.
+# Con append=True (reanudación de un crawl) se continúa lo ya exportado sin leerlo ni reescribirlo. Las citas
+# repetidas al reanudar (la página que quedó a medias se vuelve a entregar) las filtra QuoteScraper.run_pipeline
+# con el checkpoint del crawl, no el exportador.
+
+COLUMNS = ["text", "author", "tags", "about_author"]
+
+
+class Exporter(ABC):
+    extension = ""
+
+    def __init__(self, path, columns=COLUMNS, append=False):
+        self.path = path
+        self.columns = columns
+        self.rows = 0
+        # Solo se continúa un fichero que existe y no está vacío
+        self.append = append and os.path.exists(path) and os.path.getsize(path) > 0
+
+    @abstractmethod
+    def write(self, records):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvExporter(Exporter):
+    extension = ".csv"
+
+    def __init__(self, path, columns=COLUMNS, append=False):
+        super().__init__(path, columns, append)
+        self._file = open(path, "a" if self.append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction="ignore")
+        if not self.append:
+            self._writer.writeheader()
+
+    def write(self, records):
+        self._writer.writerows(records)
+        self.rows += len(records)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlExporter(Exporter):
+    extension = ".jsonl"
+
+    def __init__(self, path, columns=COLUMNS, append=False):
+        super().__init__(path, columns, append)
+        self._file = open(path, "a" if self.append else "w", encoding="utf-8")
+
+    def write(self, records):
+        self._file.writelines(
+            json.dumps({column: record.get(column) for column in self.columns}, ensure_ascii=False) + "\n"
+            for record in records
+        )
+        self.rows += len(records)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExporter(Exporter):
+    # Parquet no admite añadir a un fichero cerrado. Para no reescribirlo, cada reanudación escribe un fichero
+    # de partes nuevo junto al original (quotes_db.parquet, quotes_db.part1.parquet, ...); se leen todos
+    # juntos con pd.read_parquet(ParquetExporter.parts(ruta)). Un export nuevo borra las partes anteriores.
+    extension = ".parquet"
+
+    def __init__(self, path, columns=COLUMNS, append=False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("La exportación a Parquet requiere el paquete pyarrow (pip install pyarrow)")
+        super().__init__(path, columns, append)
+        numbers = self._part_numbers(path)
+        if self.append:
+            self.path = self._part_path(path, max(numbers, default=0) + 1)
+        else:
+            for number in numbers:
+                os.remove(self._part_path(path, number))
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in columns])
+        # Un solo writer abierto: cada lote se escribe como un row group nuevo
+        self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+
+    @staticmethod
+    def _part_path(path, number):
+        root, extension = os.path.splitext(path)
+        return f"{root}.part{number}{extension}"
+
+    @staticmethod
+    def _part_numbers(path):
+        root, extension = os.path.splitext(path)
+        pattern = re.compile(re.escape(os.path.basename(root)) + r"\.part(\d+)" + re.escape(extension) + "$")
+        matches = map(pattern.match, os.listdir(os.path.dirname(path) or "."))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    @classmethod
+    def parts(cls, path):
+        # Ficheros del export en orden: el original y las partes de cada reanudación
+        return ([path] if os.path.exists(path) else []) + [cls._part_path(path, number)
+                                                            for number in cls._part_numbers(path)]
+
+    def write(self, records):
+        if not records:
+            return
+        table = self._pa.Table.from_pydict(
+            {column: [record.get(column) for record in records] for column in self.columns}, schema=self._schema
+        )
+        self._writer.write_table(table)
+        self.rows += len(records)
+
+    def close(self):
+        self._writer.close()
+
+
+class ExcelExporter(Exporter):
+    extension = ".xlsx"
+    max_rows = 1048575  # límite de filas de Excel, sin contar la cabecera
+
+    def __init__(self, path, columns=COLUMNS, append=False):
+        from openpyxl import Workbook, load_workbook
+
+        super().__init__(path, columns, append)
+        # Modo write-only de openpyxl: las filas se van volcando sin construir la hoja en memoria
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(columns)
+        self._copied = 0
+        if self.append:
+            # El fichero se reescribe entero al cerrar: primero se copian las filas ya exportadas
+            # (acotado por el límite de filas de Excel)
+            existing = load_workbook(path, read_only=True)
+            for row in existing.active.iter_rows(min_row=2, values_only=True):
+                self._sheet.append(row)
+                self._copied += 1
+            existing.close()
+
+    def write(self, records):
+        if self._copied + self.rows + len(records) > self.max_rows:
+            raise ValueError(f"Excel admite como máximo {self.max_rows} filas; usa csv, jsonl o parquet")
+        for record in records:
+            self._sheet.append([record.get(column) for column in self.columns])
+        self.rows += len(records)
+
+    def close(self):
+        self._workbook.save(self.path)
+
+
+EXPORTERS = {
+    "csv": CsvExporter,
+    "jsonl": JsonlExporter,
+    "parquet": ParquetExporter,
+    "excel": ExcelExporter,
+}
+
+
+def get_exporter(fmt, path, columns=COLUMNS, append=False):
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Formato de exportación desconocido: {fmt}. Opciones: {', '.join(EXPORTERS)}")
+    return EXPORTERS[fmt](path, columns, append)
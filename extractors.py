@@ -0,0 +1,115 @@
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+from oop_scraper import parse_quote_page, parse_author_page
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml es opcional: sin él solo están los backends de BeautifulSoup
+    lxml = None
+
+# Backends de extracción intercambiables. Todos exponen la misma interfaz:
+#   parse_quote_page(html, base_url) -> (lista de citas, next_url)
+#   parse_author_page(html) -> descripción del autor
+
+
+class SoupExtractor:
+    # Referencia: árbol completo con html.parser (el comportamiento original del scraper)
+    name = "soup"
+
+    def parse_quote_page(self, html, base_url):
+        return parse_quote_page(html, base_url)
+
+    def parse_author_page(self, html):
+        return parse_author_page(html)
+
+
+class StrainedSoupExtractor:
+    # BeautifulSoup construyendo solo los nodos necesarios (SoupStrainer)
+    name = "strainer"
+
+    quote_strainer = SoupStrainer(class_=["quote", "next"])
+    author_strainer = SoupStrainer(class_="author-description")
+
+    def __init__(self, parser=None):
+        # Con lxml instalado, BeautifulSoup tokeniza con su parser en C
+        self.parser = parser or ("lxml" if lxml is not None else "html.parser")
+
+    def parse_quote_page(self, html, base_url):
+        soup = BeautifulSoup(html, self.parser, parse_only=self.quote_strainer)
+
+        quotes = []
+        for quote in soup.find_all(class_='quote'):
+            quotes.append({
+                "text": quote.find(class_='text').get_text(),
+                "author": quote.find(class_='author').get_text(),
+                "tags": ", ".join([tag.get_text() for tag in quote.find_all(class_='tag')]),
+                "author_url": urljoin(base_url, quote.find('a')['href'])
+            })
+
+        next_button = soup.find(class_='next')
+        next_url = urljoin(base_url, next_button.find('a')['href']) if next_button else None
+        return quotes, next_url
+
+    def parse_author_page(self, html):
+        soup = BeautifulSoup(html, self.parser, parse_only=self.author_strainer)
+        return soup.find(class_='author-description').get_text()
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlExtractor:
+    # lxml con expresiones XPath precompiladas
+    name = "lxml"
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("LxmlExtractor requiere el paquete lxml (pip install lxml)")
+        self.quotes = etree.XPath(f"//*[{_has_class('quote')}]")
+        self.text = etree.XPath(f".//*[{_has_class('text')}][1]")
+        self.author = etree.XPath(f".//*[{_has_class('author')}][1]")
+        self.tags = etree.XPath(f".//*[{_has_class('tag')}]")
+        self.author_link = etree.XPath("(.//a)[1]/@href")
+        self.next_link = etree.XPath(f"(//*[{_has_class('next')}])[1]//a[1]/@href")
+        self.description = etree.XPath(f"(//*[{_has_class('author-description')}])[1]")
+
+    def parse_quote_page(self, html, base_url):
+        tree = lxml.html.fromstring(html)
+
+        quotes = []
+        for quote in self.quotes(tree):
+            quotes.append({
+                "text": self.text(quote)[0].text_content(),
+                "author": self.author(quote)[0].text_content(),
+                "tags": ", ".join([tag.text_content() for tag in self.tags(quote)]),
+                "author_url": urljoin(base_url, self.author_link(quote)[0])
+            })
+
+        next_link = self.next_link(tree)
+        next_url = urljoin(base_url, next_link[0]) if next_link else None
+        return quotes, next_url
+
+    def parse_author_page(self, html):
+        return self.description(lxml.html.fromstring(html))[0].text_content()
+
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor,
+    StrainedSoupExtractor.name: StrainedSoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def get_extractor(extractor=None):
+    # Acepta un nombre ("soup", "strainer", "lxml", "fast"), una instancia o None (referencia)
+    if extractor is None:
+        return SoupExtractor()
+    if not isinstance(extractor, str):
+        return extractor
+    if extractor == "fast":
+        return LxmlExtractor() if lxml is not None else StrainedSoupExtractor()
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Extractor desconocido: {extractor}. Opciones: {', '.join(EXTRACTORS)}, fast")
+    return EXTRACTORS[extractor]()
@@ -1,17 +1,113 @@
+import hashlib
+import html
 import os
-import re
-import pandas as pd
 import streamlit as st
-from sqlalchemy import create_engine
-from sqlalchemy import exc
-from oop_scraper import *  # Contiene la clase QuoteScraper y funcines auxiliares
-from ai_recommender import *
-from autogen_agents import *
+from dotenv import load_dotenv
 
-def load_quotes_from_db(engine):
-    query = "SELECT * FROM quotes"
-    df = pd.read_sql_query(query, engine)
-    return df
+# Los módulos pesados (scraper, SQLAlchemy/pandas, langchain/Groq, autogen) se importan dentro de la opción
+# que los usa: el formulario de login se muestra sin cargarlos. benchmarks/bench_import.py mide el arranque.
+
+@st.cache_resource(validate=lambda database: os.path.exists(database.path))
+def get_db(db_path):
+    # Engine con pool, PRAGMAs y esquema/migraciones aplicados una sola vez por fichero,
+    # compartido entre sesiones, reruns y con QuoteScraper (mismo db.get_database)
+    from db import get_database
+    from oop_scraper import setup_schema
+
+    return get_database(db_path, setup=setup_schema)
+
+
+@st.cache_resource
+def get_vector_index(directory):
+    # Índice vectorial de las citas (memmap), compartido entre sesiones; sync() añade las filas nuevas
+    from vectors import VectorIndex
+
+    return VectorIndex(directory)
+
+
+@st.cache_resource
+def get_response_cache(db_path):
+    # Respuestas del recomendador: memoria (LRU) y SQLite, caducan en un día
+    from response_cache import ResponseCache
+
+    return ResponseCache(db_path, ttl=24 * 3600)
+
+
+# Consultas cacheadas: `version` (mtime/tamaño de la BBDD) forma parte de la clave,
+# así que cualquier escritura invalida las páginas guardadas sin tener que limpiar la caché.
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_page(db_path, version, table, columns, after_id, limit, author, tag):
+    from queries import fetch_page
+
+    return fetch_page(get_db(db_path).engine, table, list(columns), after_id, limit, author, tag)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_count(db_path, version, table, author, tag):
+    from queries import count_rows
+
+    return count_rows(get_db(db_path).engine, table, author, tag)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def cached_csv(db_path, version, table, author, tag, chunk_size=10000):
+    # CSV completo construido por páginas de keyset, sin un único SELECT de toda la tabla
+    from queries import fetch_page
+
+    engine = get_db(db_path).engine
+    parts, after_id = [], 0
+    while True:
+        page = fetch_page(engine, table, None, after_id, chunk_size, author, tag)
+        if page.empty:
+            break
+        parts.append(page.to_csv(index=False, header=not parts))
+        after_id = int(page["id"].iloc[-1])
+    return "".join(parts).encode('utf-8')
+
+
+def show_table_browser(db_path, table, key):
+    # Navegador paginado de una tabla: filtros, columnas visibles y páginas de tamaño fijo
+    from queries import BROWSE_COLUMNS, db_version
+
+    db_path = os.path.abspath(db_path)
+    with st.expander("Filtros y columnas"):
+        author = st.text_input("Autor", key=f"{key}_author").strip() or None
+        tag = st.text_input("Etiqueta", key=f"{key}_tag").strip() or None
+        columns = st.multiselect("Columnas", BROWSE_COLUMNS[table], default=list(BROWSE_COLUMNS[table]),
+                                 key=f"{key}_columns")
+        page_size = st.selectbox("Filas por página", (25, 50, 100, 500), index=2, key=f"{key}_page_size")
+
+    # Pila de ids de inicio de cada página visitada; se reinicia si cambian los filtros
+    state_key = f"{key}_pages"
+    filters = (author, tag, page_size)
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[state_key] = [0]
+    pages = st.session_state[state_key]
+
+    version = db_version(db_path)
+    total = cached_count(db_path, version, table, author, tag)
+    page = cached_page(db_path, version, table, tuple(columns), pages[-1], page_size, author, tag)
+
+    st.caption(f"{total} filas · página {len(pages)} de {max(1, -(-total // page_size))}")
+    st.dataframe(page[[name for name in page.columns if name in columns] or page.columns], hide_index=True)
+
+    previous_col, next_col = st.columns(2)
+    if previous_col.button("Anterior", key=f"{key}_previous", disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    if next_col.button("Siguiente", key=f"{key}_next", disabled=len(page) < page_size):
+        pages.append(int(page["id"].iloc[-1]))
+        st.rerun()
+
+    if st.checkbox("Preparar descarga en .CSV", key=f"{key}_csv"):
+        st.download_button(
+            label="Descargar en .CSV",
+            data=cached_csv(db_path, version, table, author, tag),
+            file_name=f"{table}.csv",
+            mime="text/csv",
+            key=f"{key}_download",
+        )
 
 
 def main():
@@ -50,8 +146,8 @@ def main():
             submit_button = st.form_submit_button("Login")
 
             if submit_button:
-                
-                if username in users  and users["admin"] == hash_string(password):
+                # Mismo MD5 que oop_scraper.hash_string, sin importar el scraper (SQLAlchemy, pandas...)
+                if username in users  and users["admin"] == hashlib.md5(password.encode()).hexdigest():
                     st.session_state.logged_in = True
                     st.success("Autenticación realizada con éxito")
                     st.rerun()
@@ -61,7 +157,7 @@ def main():
     # Interfaz de Scraping
     if st.session_state.logged_in:
         st.sidebar.title("Opciones de Scraping")
-        option = st.sidebar.radio("Elige una opción: ", ("Scraping Básico", "Recomendador - IA",  "Búsqueda Global - IA"))
+        option = st.sidebar.radio("Elige una opción: ", ("Scraping Básico", "Buscar Frases", "Recomendador - IA",  "Búsqueda Global - IA"))
 
         if option == "Scraping Básico":
             st.subheader("Scraper Básico de: https://quotes.toscrape.com")
@@ -71,12 +167,8 @@ def main():
                 start_scraping = st.form_submit_button("Iniciar Scraping")
 
             if start_scraping:
-                db_path = "sqlite:///quotes.db"
-                engine = create_engine(db_path)
-
                 if os.path.exists("quotes.db"):
                     st.info("BBDD existente. Cargando quotes.")
-                    result_df = load_quotes_from_db(engine)
                 else:
                     st.info("No hay BBDD. Iniciando scraping.")
                     # Crea una barra de progreso
@@ -84,30 +176,52 @@ def main():
                     status_text = st.empty()
 
                     # Ejecutar el scraper
-                    scraper = QuoteScraper("https://quotes.toscrape.com/")
+                    from oop_scraper import QuoteScraper
+
+                    scraper = QuoteScraper("https://quotes.toscrape.com/", vector_index=get_vector_index("quotes_vectors"))
 
                     # Actualizar la barra de progreso (simplificada)
                     status_text.text("Scraping en proceso...")
                     progress_bar.progress(50)
 
-                    result_df = scraper.run()
+                    scraper.run()
 
                     # Actualizar progreso
                     progress_bar.progress(100)
                     status_text.text("Scraping completado!")
 
-                    
+                # El navegador sigue visible en los reruns (paginación, filtros)
+                st.session_state.show_quotes = True
+
+            if st.session_state.get("show_quotes") and os.path.exists("quotes.db"):
                 # Mostrar las frases
                 st.subheader("Frases Disponibles")
-                st.dataframe(result_df, hide_index=True)
+                show_table_browser("quotes.db", "quotes", "quotes")
+
+        elif option == "Buscar Frases":
+            st.subheader("Búsqueda de Frases en la BBDD")
+            with st.form("search_form"):
+                search_query = st.text_input("**Texto, autor o etiqueta:**")
+                search_mode = st.radio("Tipo de búsqueda", ("Palabras", "Prefijo", "Frase exacta"), horizontal=True)
+                n_results = st.number_input("Número máximo de resultados", min_value=1, max_value=500, value=20, step=1)
+                start_search = st.form_submit_button("Buscar")
+
+            if start_search:
+                if not os.path.exists("quotes.db"):
+                    st.error("Database file not found. Please run the basic scraper first.")
+                    return
+
+                # BBDD creadas antes del índice FTS5: get_db lo crea y rellena la primera vez
+                from search import search_quotes
 
-                # Descarga en csv de las frases encontradas
-                st.download_button(
-                    label="Descargar en .CSV",
-                    data=result_df.to_csv(index=False).encode('utf-8'),
-                    file_name="scraped_quotes.csv",
-                    mime="text/csv",
-                )
+                modes = {"Palabras": "words", "Prefijo": "prefix", "Frase exacta": "phrase"}
+                results = search_quotes(get_db("quotes.db").engine, search_query, mode=modes[search_mode],
+                                        limit=int(n_results))
+
+                if results.empty:
+                    st.info("No se han encontrado frases.")
+                else:
+                    st.dataframe(results[['text', 'author', 'tags']], hide_index=True)
 
         elif option == "Recomendador - IA":
             st.subheader("Recomendador de Frases")
@@ -117,52 +231,46 @@ def main():
                 start_advanced_scraping = st.form_submit_button("Lanzar Recomendador")
 
             if start_advanced_scraping:
-                db_path = "sqlite:///quotes.db"
-                engine = create_engine(db_path)
-
-                if os.path.exists("quotes.db"):
-                    result_df = load_quotes_from_db(engine)
-                else:
+                if not os.path.exists("quotes.db"):
                     st.error("Database file not found. Please run the basic scraper first.")
                     return
-                
-                df_selected = result_df[['text', 'tags', 'author']].copy()
-                df_selected['text'] = df_selected['text'].str.slice(0, 80)
 
-                response = dame_quotes(user_query, n_quotes, df_selected)
+                from retrieval import shortlist_size, top_k_candidates
+
+                # Solo las citas más relevantes (BM25 y similitud vectorial, en local) llegan al prompt
+                engine = get_db("quotes.db").engine
+                vector_index = get_vector_index("quotes_vectors")
+                with st.spinner("Actualizando el índice de citas..."):
+                    vector_index.sync(engine)
+                candidates = top_k_candidates(engine, user_query, shortlist_size(n_quotes), vector_index=vector_index)
+                df_selected = candidates[['text', 'tags', 'author']]
+
+                from ai_recommender import stream_quotes
 
                 # Muestra los resultados
                 st.subheader("Frases Seleccionadas:")
-                with st.container():
-                    # Parsing
-                    split_response = re.split(r'(\d+\.\s*")', response)
-                    
-                    
-                    if split_response[0] == '':
-                        split_response.pop(0)
-                    
-                    formatted_response = []
-                    for i in range(0, len(split_response), 2):
-                        if i+1 < len(split_response):
-                            formatted_response.append(split_response[i] + split_response[i+1])
-                        else:
-                            formatted_response.append(split_response[i])
-                    
-                    # Construye la respuesta en el formato adecuado
-                    final_response = "<br><br>".join(formatted_response)
-                    
-                    st.markdown(f"""
+                placeholder = st.empty()
+                quotes = []
+                # Cada frase se muestra en cuanto el modelo termina de escribir su id (streaming);
+                # misma consulta, n y candidatas: respuesta cacheada, sin llamar al modelo
+                for quote in stream_quotes(user_query, n_quotes, df_selected,
+                                           cache=get_response_cache("recommender_cache.db")):
+                    # Las frases se reconstruyen completas a partir de los ids que devuelve el modelo
+                    quotes.append(f"{len(quotes) + 1}. \"{html.escape(quote['text'])}\" - {html.escape(quote['author'])}")
+                    final_response = "<br><br>".join(quotes)
+                    placeholder.markdown(f"""
                     <div class="quote-box">
                         {final_response}
                     </div>
                     """, unsafe_allow_html=True)
+                if not quotes:
+                    placeholder.info("El modelo no ha seleccionado ninguna frase.")
                                 
 
 
         elif option == "Búsqueda Global - IA":
 
             DB_PATH = "quotes_internet.db"
-            DB_URL = f"sqlite:///{DB_PATH}"
 
             st.subheader("Búsqueda Global en Internet")
             with st.form("internet_search_form"):
@@ -178,17 +286,13 @@ def main():
 
                 
                 
-                # Nos aseguramos que exista la base de datos de búsquedas en Internet
-                if not os.path.exists(DB_PATH):
-                    temp_engine = create_engine(DB_URL)
-                    Base.metadata.create_all(temp_engine)
-                    temp_engine.dispose()
-
-                # Create engine and session
-                engine1 = create_engine(DB_URL)
-                Base.metadata.create_all(engine1)
-                Session = sessionmaker(bind=engine1)
-                session = Session()
+                from sqlalchemy import exc
+                from autogen_agents import create_quotes_dataframe, get_quotes, parse_quotes
+                from oop_scraper import Quote_internet, quote_internet_tags, sync_tags
+                from search import index_new_rows
+
+                # Sesión del engine compartido (la BBDD y su esquema se crean la primera vez)
+                session = get_db(DB_PATH).Session()
 
                 try:
 
@@ -201,6 +305,7 @@ def main():
                     st.dataframe(quotes_df.head(n_quotes), hide_index=True)
                     
                     # Almacenar las frases
+                    stored_quotes = []
                     for _, row in quotes_df.iterrows():
                         quote = Quote_internet(
                             text=row['text'],
@@ -209,8 +314,14 @@ def main():
                             source=row['source']
                         )
                         session.add(quote)
+                        stored_quotes.append(quote)
                     
-        
+                    # Índices de etiquetas y de texto completo en la misma transacción
+                    session.flush()
+                    sync_tags(session, quote_internet_tags, [(quote.id, quote.tags) for quote in stored_quotes],
+                              replace=False)
+                    if stored_quotes:
+                        index_new_rows(session, "quotes_internet", min(quote.id for quote in stored_quotes) - 1)
                     session.commit()
                     st.success("Quotes successfully stored in the database.")
                 
@@ -222,19 +333,19 @@ def main():
                     session.rollback()
                 finally:
                     session.close()
-                    engine1.dispose()
 
             
             if st.button("Mostrar la Base de Datos"):
-                engine = create_engine(DB_URL)
-                try:
-                    with engine.connect() as connection:
-                        df = pd.read_sql_table("quotes_internet", connection)
-                    st.dataframe(df, hide_index=True)
-                except Exception as e:
-                    st.error(f"Error cargando contenido de la BBDD: {str(e)}")
-                finally:
-                    engine.dispose()
+                st.session_state.show_internet_quotes = True
+
+            if st.session_state.get("show_internet_quotes"):
+                if os.path.exists(DB_PATH):
+                    try:
+                        show_table_browser(DB_PATH, "quotes_internet", "internet")
+                    except Exception as e:
+                        st.error(f"Error cargando contenido de la BBDD: {str(e)}")
+                else:
+                    st.info("Todavía no hay frases guardadas.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import hashlib
+import sqlite3
+import threading
+
+
+class HttpCache:
+    # Caché HTTP en disco: guarda ETag, Last-Modified y hash del cuerpo de cada URL
+    # para hacer peticiones condicionales y detectar páginas sin cambios.
+    # La conexión se abre al primer uso y close() la libera (un uso posterior la vuelve a abrir)
+    def __init__(self, db_path='http_cache.db'):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Validadores descargados pero aún no confirmados (ver resolve/commit)
+        self._staged = {}
+        self._conn = None
+
+    def _connection(self):
+        # Se llama con self._lock adquirido
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    next_url TEXT
+                )"""
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT etag, last_modified, body_hash, body, next_url FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("etag", "last_modified", "body_hash", "body", "next_url"), row))
+
+    def conditional_headers(self, url):
+        entry = self.get(url)
+        headers = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def resolve(self, url, status_code, headers, body, defer=False):
+        # Devuelve (cuerpo, changed). Un 304 o un cuerpo con el mismo hash cuentan como "sin cambios".
+        # defer=True (páginas de listado): los validadores nuevos quedan pendientes hasta commit(), que se llama
+        # cuando las citas de la página ya están guardadas. Si el crawl falla antes, el siguiente no la
+        # verá como "sin cambios" y la volverá a procesar.
+        entry = self.get(url)
+        if status_code == 304 and entry is not None:
+            self.hits += 1
+            return entry["body"], False
+
+        body_hash = hash_body(body)
+        changed = entry is None or entry["body_hash"] != body_hash
+        if changed:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        row = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"),
+               "body_hash": body_hash, "body": body, "next_url": None}
+        with self._lock:
+            self._staged[url] = row
+        if not defer:
+            self.commit([url])
+        return body, changed
+
+    def commit(self, urls=None):
+        # Guarda los validadores pendientes de esas URLs (todas si urls es None)
+        with self._lock:
+            urls = list(self._staged) if urls is None else [url for url in urls if url in self._staged]
+            if not urls:
+                return
+            conn = self._connection()
+            conn.executemany(
+                """INSERT INTO http_cache (url, etag, last_modified, body_hash, body, next_url)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       etag = excluded.etag,
+                       last_modified = excluded.last_modified,
+                       body_hash = excluded.body_hash,
+                       body = excluded.body,
+                       next_url = coalesce(excluded.next_url, CASE WHEN http_cache.body_hash = excluded.body_hash
+                                                                   THEN http_cache.next_url ELSE NULL END)""",
+                [(url, row["etag"], row["last_modified"], row["body_hash"], row["body"], row["next_url"])
+                 for url, row in ((url, self._staged.pop(url)) for url in urls)],
+            )
+            conn.commit()
+
+    def discard(self):
+        with self._lock:
+            self._staged.clear()
+
+    def get_next_url(self, url):
+        # None: desconocido (hay que parsear); "": última página
+        entry = self.get(url)
+        if entry is None or entry["next_url"] is None:
+            return None
+        return entry["next_url"]
+
+    def set_next_url(self, url, next_url):
+        with self._lock:
+            if url in self._staged:
+                self._staged[url]["next_url"] = next_url or ""
+                return
+            conn = self._connection()
+            conn.execute("UPDATE http_cache SET next_url = ? WHERE url = ?", (next_url or "", url))
+            conn.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def hash_body(body):
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
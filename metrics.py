@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Métricas del crawl: contadores, gauges e histogramas con etiquetas en un registro en memoria.
+# Las sinks (Prometheus en texto, resumen JSON) lo vuelcan al final de cada ejecución; QuoteScraper
+# lo pone a cero al empezar cada una, así que los valores (y "elapsed") son siempre de la última.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tiempo acumulado por etapa, para saber si un crawl lento está limitado por red, parseo o BBDD
+STAGES = {
+    "network": "scraper_request_seconds",
+    "parse": "scraper_parse_seconds",
+    "storage": "scraper_db_batch_seconds",
+}
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.gauges = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = _key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = _key(labels)
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_request(self, host, status, latency, nbytes=0):
+        status = "error" if status is None else str(status)
+        self.inc("scraper_requests_total", host=host, status=status)
+        self.observe("scraper_request_seconds", latency, host=host, status=status)
+        if nbytes:
+            self.inc("scraper_bytes_downloaded_total", nbytes, host=host)
+
+    def record_cache(self, cache, stats):
+        for stat, value in stats.items():
+            self.set(f"scraper_cache_{stat}", value, cache=cache)
+
+    def counter_total(self, name):
+        return sum(self.counters.get(name, {}).values())
+
+    def histogram_sum(self, name):
+        return sum(histogram.sum for histogram in self.histograms.get(name, {}).values())
+
+    def summary(self):
+        with self._lock:
+            stages = {stage: round(self.histogram_sum(name), 6) for stage, name in STAGES.items()}
+            return {
+                "started": self.started,
+                "elapsed": round(time.time() - self.started, 6),
+                # En modo async las peticiones se solapan: "network" suma la latencia de todas ellas
+                "stage_seconds": stages,
+                "bound": max(stages, key=stages.get) if any(stages.values()) else None,
+                "counters": {name: [dict(key, value=value) for key, value in series.items()]
+                             for name, series in self.counters.items()},
+                "gauges": {name: [dict(key, value=value) for key, value in series.items()]
+                           for name, series in self.gauges.items()},
+                "histograms": {name: [dict(key, count=h.count, sum=round(h.sum, 6)) for key, h in series.items()]
+                               for name, series in self.histograms.items()},
+            }
+
+    def prometheus(self):
+        # Formato de exposición de texto de Prometheus
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{name}_bucket{_labels(key, le=bound)} {count}")
+                    lines.append(f"{name}_bucket{_labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key, **extra):
+    items = list(key) + list(extra.items())
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in items)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + "}"
+
+
+class PrometheusSink:
+    # Escribe el registro en un fichero .prom (p. ej. para el textfile collector de node_exporter)
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, registry):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(registry.prometheus())
+
+
+class JsonSummarySink:
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, registry):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(registry.summary(), f, indent=2, ensure_ascii=False)
@@ -1,23 +1,51 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, Text
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import func, inspect, insert, select, text, update, delete, Column, ForeignKey, Index, Integer, LargeBinary, String, Table, Text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.exc import OperationalError
 from datetime import datetime
+from urllib.parse import urljoin, urlparse
 import logging
+import time
+from contextlib import contextmanager
 import hashlib
+import unicodedata
+import re
 import os
+from author_cache import AuthorCache
+from http_cache import HttpCache
+from db import get_database
+from pipeline import run_pipeline
+from rate_limiter import RateLimiter, RetryPolicy, parse_retry_after
+from checkpoint import CrawlCheckpoint, CrawlState
+from exporters import EXPORTERS, get_exporter
+from metrics import MetricsRegistry
+from search import create_search_index, index_new_rows
 
 Base = declarative_base()
 
+class Author(Base):
+    __tablename__ = 'authors'
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String(150), unique=True, nullable=False)
+    name = Column(String(100))
+    about = Column(Text)
+
 class Quote(Base):
     __tablename__ = 'quotes'
 
     id = Column(Integer, primary_key=True)
     text = Column(Text)
-    author = Column(String(100))
+    # El nombre se mantiene en la cita (hash de contenido, búsquedas por autor y FTS);
+    # la biografía vive una sola vez en authors
+    author = Column(String(100), index=True)
+    author_id = Column(Integer, ForeignKey('authors.id'), index=True)
     tags = Column(String(200))
-    about_author = Column(Text)
+    # Digest binario de 16 bytes (quote_hash): la mitad que el hex de 64 caracteres, en la tabla y en el índice único
+    content_hash = Column(LargeBinary(16), unique=True, index=True)
 
 class Quote_internet(Base):
     __tablename__ = 'quotes_internet'
@@ -28,100 +56,506 @@ class Quote_internet(Base):
     tags = Column(String(200))
     source =  Column(String(300))
 
+# Índice normalizado de etiquetas: una fila por etiqueta y tablas de asociación cita-etiqueta.
+# La clave primaria (quote_id, tag_id) sirve para "etiquetas de una cita" y el índice (tag_id, quote_id)
+# para "citas con una etiqueta" sin recorrer la tabla de citas.
+class Tag(Base):
+    __tablename__ = 'tags'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, nullable=False)
+
+quote_tags = Table(
+    'quote_tags', Base.metadata,
+    Column('quote_id', Integer, ForeignKey('quotes.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_quote_tags_tag_id', 'tag_id', 'quote_id'),
+    sqlite_with_rowid=False,
+)
+
+quote_internet_tags = Table(
+    'quote_internet_tags', Base.metadata,
+    Column('quote_id', Integer, ForeignKey('quotes_internet.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_quote_internet_tags_tag_id', 'tag_id', 'quote_id'),
+    sqlite_with_rowid=False,
+)
+
 class QuoteScraper:
-    def __init__(self, url, db_name='quotes.db'):
+    def __init__(self, url, db_name='quotes.db', author_cache_path=None, http_cache_path=None,
+                 echo=False, pragmas=None, batch_size=5000, extractor=None,
+                 rate_limiter=None, retry_policy=None, timeout=(5, 30), exports=(),
+                 metrics=None, metrics_sinks=(), vector_index=None, parse_workers=0):
+        from extractors import get_extractor
+
         self.url = url
+        # Backend de parseo: None/"soup" (referencia), "strainer", "lxml" o "fast"
+        self.extractor = get_extractor(extractor)
+        # parse_workers > 0: el HTML se parsea en un pool de procesos (parse_pool.ParsePool) en todos
+        # los modos de crawl: síncrono, concurrente y multi-sitio
+        self.parse_workers = parse_workers
         self.db_name = db_name
+        self.echo = echo
+        self.pragmas = pragmas
+        self.batch_size = batch_size
+        self.author_cache_path = author_cache_path
+        self.author_cache = AuthorCache(author_cache_path)
+        # Con http_cache_path los re-crawls usan peticiones condicionales y omiten las páginas sin cambios
+        self.http_cache = HttpCache(http_cache_path) if http_cache_path else None
+        # Capa HTTP: límite de tasa adaptativo por host, reintentos con backoff y timeouts (conexión, lectura)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.db_path = os.path.join(self.script_dir, db_name)
         self.excel_path = os.path.join(self.script_dir, "quotes_db.xlsx")
+        # Formatos de exportación opcionales: "csv", "jsonl", "parquet" y "excel"
+        self.exports = list(exports)
+        # Métricas del crawl (peticiones, latencias, bytes, parseo, escritura en BBDD, cachés).
+        # Las sinks (PrometheusSink, JsonSummarySink) las vuelcan al final de cada ejecución.
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics_sinks = list(metrics_sinks)
+        # Índice vectorial opcional (vectors.VectorIndex): se actualiza con las citas nuevas tras cada escritura
+        self.vector_index = vector_index
         self.setup_database()
         self.logger = get_logger()
 
     def setup_database(self):
-        db_path = os.path.abspath(self.db_name)
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=True)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        # Engine compartido por fichero (también con la GUI): el esquema y las migraciones se aplican una vez
+        self.database = get_database(self.db_name, echo=self.echo, pragmas=self.pragmas, setup=setup_schema)
+        self.engine = self.database.engine
+        self.Session = self.database.Session
 
     def scrape_quotes(self):
-        quotes_data = []
-        next_url = self.url
+        return pd.DataFrame(list(self.iter_quotes()))
+
+    def iter_quotes(self, state=None):
+        # Generador: produce cada cita (con la biografía del autor) en cuanto se procesa su página.
+        # `state` (CrawlState) lleva la frontera, las páginas visitadas y los autores completados.
+        state = state or CrawlState([self.url])
+        # Cada autor se descarga una sola vez por crawl (y entre crawls si la caché es persistente)
+        self.author_cache.close()
+        self.author_cache = AuthorCache(self.author_cache_path)
+        for author_url, about_author in state.authors.items():
+            self.author_cache.set(author_url, about_author)
 
-        while next_url:
-            response = requests.get(next_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+        pending = state.pending()
+        next_url = pending[0] if pending else None
+        parse_pool = None
+        if self.parse_workers:
+            from parse_pool import ParsePool  # importa extractors, que importa este módulo
+            parse_pool = ParsePool(self.parse_workers, self.extractor.name)
 
-            quote_elements = soup.find_all(class_='quote')
-            for quote in quote_elements:
-                text = quote.find(class_='text').get_text()
-                author = quote.find(class_='author').get_text()
-                tags = ", ".join([tag.get_text() for tag in quote.find_all(class_='tag')])
+        try:
+            while next_url and next_url not in state.visited:
+                page_url = next_url
+                state.start_page(page_url)
+                # Los validadores de la página se confirman cuando sus citas ya están guardadas (ver HttpCache)
+                html, changed = self.fetch_page(page_url, defer=True)
 
-                author_link = quote.find('a')['href']
-                author_url = f"http://quotes.toscrape.com{author_link}"
-                about_author = self.scrape_author(author_url)
+                # Página sin cambios: solo necesitamos el enlace a la siguiente
+                cached_next = self.http_cache.get_next_url(page_url) if not changed else None
+                if cached_next is not None:
+                    next_url = cached_next or None
+                    state.finish_page(page_url, next_url)
+                    continue
 
-                quotes_data.append({
-                    "text": text,
-                    "author": author,
-                    "tags": tags,
-                    "about_author": about_author
-                })
+                with self.metrics.timer("scraper_parse_seconds", kind="listing"):
+                    if parse_pool is None:
+                        quotes, next_url = self.extractor.parse_quote_page(html, page_url)
+                    else:
+                        result = parse_pool.submit_listing(page_url, html).result()
+                        quotes, next_url = result["quotes"], result["next_url"]
+                if self.http_cache is not None:
+                    self.http_cache.set_next_url(page_url, next_url)
 
-            next_button = soup.find(class_='next')
-            next_url = f"http://quotes.toscrape.com{next_button.find('a')['href']}" if next_button else None
+                quotes = quotes if changed else []
+                scrape_author = self.scrape_author
+                if parse_pool is not None:
+                    # Cada biografía se parsea en el pool mientras se descarga la siguiente
+                    parsed = self.submit_authors(parse_pool, [quote["author_url"] for quote in quotes])
+                    scrape_author = lambda url: self.parsed_author(parsed[url])
 
-        return pd.DataFrame(quotes_data)
+                for quote in quotes:
+                    author_url = quote.pop("author_url")
+                    about_author = self.author_cache.get_or_fetch(author_url, scrape_author)
+                    state.add_author(author_url, about_author)
+                    quote["about_author"] = about_author
+                    yield quote
+
+                state.finish_page(page_url, next_url)
+        finally:
+            if parse_pool is not None:
+                parse_pool.close()
+
+        self.logger.info(f"Caché de autores: {self.author_cache.stats()}")
+        if self.http_cache is not None:
+            self.logger.info(f"Caché HTTP: {self.http_cache.stats()}")
+
+    def scrape_quotes_async(self, max_concurrency=20, max_per_host=10, parse_workers=None):
+        # Modo concurrente: mismas columnas que scrape_quotes, pero con un cliente HTTP compartido
+        crawler = self.async_crawler(max_concurrency, max_per_host, parse_workers)
+        df = crawler.run()
+        self.logger.info(f"Caché de autores: {self.author_cache.stats()}")
+        return df
+
+    def async_crawler(self, max_concurrency=20, max_per_host=10, parse_workers=None):
+        from async_crawler import AsyncQuoteCrawler
+
+        if parse_workers is None:
+            parse_workers = self.parse_workers
+
+        self.author_cache.close()
+        self.author_cache = AuthorCache(self.author_cache_path)
+        return AsyncQuoteCrawler(self.url, max_concurrency=max_concurrency, max_per_host=max_per_host,
+                                 author_cache=self.author_cache, http_cache=self.http_cache,
+                                 extractor=self.extractor, parse_workers=parse_workers,
+                                 rate_limiter=self.rate_limiter, retry_policy=self.retry_policy,
+                                 timeout=self.timeout, metrics=self.metrics)
 
     def scrape_author(self, author_url):
-        response = requests.get(author_url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        about_author = soup.find(class_='author-description').get_text()
-        return about_author
+        html, _ = self.fetch_page(author_url)
+        with self.metrics.timer("scraper_parse_seconds", kind="author"):
+            return self.extractor.parse_author_page(html)
+
+    def submit_authors(self, parse_pool, author_urls):
+        # Descarga las biografías de la página que no están en caché y envía cada una al pool sin esperar
+        # a su parseo: {url: Future}
+        parsed = {}
+        for author_url in author_urls:
+            if author_url not in parsed and self.author_cache.get(author_url) is None:
+                html, _ = self.fetch_page(author_url)
+                parsed[author_url] = parse_pool.submit_author(author_url, html)
+        return parsed
+
+    def parsed_author(self, future):
+        # Como en async_crawler, con pool se mide la espera hasta tener el resultado (incluye el IPC)
+        with self.metrics.timer("scraper_parse_seconds", kind="author"):
+            return future.result()["about_author"]
+
+    def fetch_page(self, url, defer=False):
+        if self.http_cache is None:
+            return self.request(url).text, True
+
+        response = self.request(url, headers=self.http_cache.conditional_headers(url))
+        return self.http_cache.resolve(url, response.status_code, response.headers, response.text, defer=defer)
+
+    def request(self, url, headers=None):
+        attempt = 0
+        while True:
+            with self.rate_limiter.acquire(url):
+                start = time.monotonic()
+                try:
+                    response = requests.get(url, headers=headers, timeout=self.timeout)
+                    status, error = response.status_code, None
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, status, error = None, None, e
+                latency = time.monotonic() - start
+
+            self.metrics.record_request(urlparse(url).netloc, status, latency,
+                                        len(response.content) if response is not None else 0)
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None and \
+                status in self.retry_policy.retry_statuses else None
+            self.rate_limiter.record(url, status, latency, retry_after)
+
+            if self.retry_policy.should_retry(status, attempt):
+                delay = self.retry_policy.delay(attempt, retry_after)
+                self.logger.warning(f"Reintentando {url} en {delay:.2f}s (estado: {status or error})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if error is not None:
+                raise error
+            # Errores no reintentables (4xx) o reintentos agotados: como en async_crawler, no se parsea la respuesta
+            response.raise_for_status()
+            return response
 
     def store_data(self, df):
+        try:
+            return self.store_records(dataframe_records(df))
+        except Exception as e:
+            self.logger.error(f"Error al almacenar los datos: {e}")
+
+    def store_records(self, records):
+        # Upsert por hash de contenido: inserta las citas nuevas, actualiza las modificadas
+        # y deja intactas las que ya existen, de modo que repetir el scraping no duplica filas.
+        # Todo va en una transacción y con executemany por lotes en lugar de un session.add por fila.
+        # Las biografías se guardan una vez por autor en authors y las citas lo referencian por author_id.
+        result = {"inserted": 0, "updated": 0, "unchanged": 0}
+        updated_ids = []
+        rows = {}
+        authors = {}
+        for record in records:
+            content_hash = quote_hash(record['text'], record['author'])
+            slug = author_slug(record['author'])
+            rows[content_hash] = {"text": record['text'], "author": record['author'], "tags": record['tags'],
+                                  "author_id": slug, "content_hash": content_hash}
+            authors[slug] = {"slug": slug, "name": record['author'], "about": record['about_author']}
+
         session = self.Session()
+        start = time.perf_counter()
         try:
-            for _, row in df.iterrows():
-                quote = Quote(
-                    text=row['text'],
-                    author=row['author'],
-                    tags=row['tags'],
-                    about_author=row['about_author']
-                )
-                session.add(quote)
+            author_ids = upsert_authors(session, list(authors.values()))
+            for row in rows.values():
+                row['author_id'] = author_ids[row['author_id']]
+            hashes = list(rows)
+            for i in range(0, len(hashes), self.batch_size):
+                batch = [rows[content_hash] for content_hash in hashes[i:i + self.batch_size]]
+                inserts, updates, unchanged = self._split_batch(session, batch)
+
+                if inserts:
+                    # INSERT de Core (executemany) para evitar el coste de la capa ORM en cargas grandes
+                    last_id = session.execute(select(func.max(Quote.id))).scalar() or 0
+                    session.execute(insert(Quote.__table__), inserts)
+                    # Los ids nuevos son los mayores que el máximo previo (estamos dentro de la transacción)
+                    inserted_ids = {row.content_hash: row.id for row in session.execute(
+                        select(Quote.id, Quote.content_hash).where(Quote.id > last_id))}
+                    index_new_rows(session, "quotes", last_id)
+                    sync_tags(session, quote_tags,
+                              [(inserted_ids[record['content_hash']], record['tags']) for record in inserts],
+                              replace=False)
+                if updates:
+                    session.execute(update(Quote), updates)
+                    sync_tags(session, quote_tags, [(record['id'], record['tags']) for record in updates])
+                    updated_ids += [record['id'] for record in updates]
+
+                result["inserted"] += len(inserts)
+                result["updated"] += len(updates)
+                result["unchanged"] += unchanged
             session.commit()
-        except Exception as e:
-            print(f"An error occurred while storing data: {e}")
+            self.metrics.observe("scraper_db_batch_seconds", time.perf_counter() - start)
+            for key, value in result.items():
+                self.metrics.inc("scraper_db_rows_total", value, result=key)
+            if self.vector_index is not None and (result["inserted"] or updated_ids):
+                self.sync_vector_index(updated_ids)
+            return result
+        except Exception:
             session.rollback()
+            raise
         finally:
             session.close()
 
-    def run(self):
-        print("Comenzando scraping...")
+    def sync_vector_index(self, changed_ids=()):
+        # Los datos ya están guardados: un fallo del índice no debe perder la escritura (se recupera en el próximo sync)
+        try:
+            with self.metrics.timer("scraper_vector_sync_seconds"):
+                self.vector_index.sync(self.engine, changed_ids=changed_ids)
+        except Exception as e:
+            self.logger.warning(f"Error al actualizar el índice vectorial: {e}")
+
+    def _split_batch(self, session, batch):
+        existing = {}
+        hashes = [record['content_hash'] for record in batch]
+        # Consultas IN acotadas para no superar el límite de parámetros de SQLite
+        for i in range(0, len(hashes), 500):
+            query = select(Quote.id, Quote.content_hash, Quote.text, Quote.tags, Quote.author_id) \
+                .where(Quote.content_hash.in_(hashes[i:i + 500]))
+            for row in session.execute(query):
+                existing[row.content_hash] = row
+
+        inserts, updates, unchanged = [], [], 0
+        for record in batch:
+            current = existing.get(record['content_hash'])
+            if current is None:
+                inserts.append(record)
+            elif (current.text, current.tags, current.author_id) != (record['text'], record['tags'], record['author_id']):
+                updates.append({"id": current.id, "text": record['text'], "tags": record['tags'],
+                                "author_id": record['author_id']})
+            else:
+                unchanged += 1
+        return inserts, updates, unchanged
+
+    def run(self, concurrent=False):
         self.logger.info ("Scraping iniciado.")
-        df = self.scrape_quotes()
-        print(f"Scraping completado. Citas totales recopiladas: {len(df)}")
-        self.logger.info (f"Scraping completado. Citas totales recopiladas: {len(df)}")
+        self.reset_metrics()
+        try:
+            df = self.scrape_quotes_async() if concurrent else self.scrape_quotes()
+            self.logger.info (f"Scraping completado. Citas totales recopiladas: {len(df)}")
 
-        print("Almacenando datos en BBDD...")
-        self.logger.info ("Almacenando datos en BBDD.")
-        self.store_data(df)
-        print("Almacenamiento de datos finalizado.")
-        self.logger.info ("Almacenamiento de datos finalizado.")
+            if df.empty:
+                self.logger.info ("Sin citas nuevas o modificadas. Nada que almacenar.")
+                self.commit_http_cache()
+                return df
 
-        df.to_excel(self.excel_path, index=False)
-        print(f"Datos almacenados en Excel: {self.excel_path}")
-        self.logger.info (f"Datos almacenados en Excel: {self.excel_path}")
+            self.logger.info ("Almacenando datos en BBDD.")
+            counts = self.store_data(df)
+            self.logger.info (f"Almacenamiento de datos finalizado: {counts}")
+            if counts is not None:
+                self.commit_http_cache()
 
-        print("Proceso de Scraping finalizado.")
-        self.logger.info ("Proceso de Scraping finalizado.")
+            exporters = self.open_exporters()
+            try:
+                records = dataframe_records(df)
+                for exporter in exporters:
+                    exporter.write(records)
+            finally:
+                self.close_exporters(exporters)
+        finally:
+            if self.http_cache is not None:
+                self.http_cache.discard()
+            self.flush_metrics()
+            self.close_caches()
 
+        self.logger.info ("Proceso de Scraping finalizado.")
         return df
 
+    def run_pipeline(self, concurrent=False, batch_size=500, resume=False, checkpoint_every=1):
+        # Modo streaming: las citas se guardan en BBDD por lotes según se completan las páginas,
+        # sin construir el DataFrame completo. Si el crawl falla, los lotes anteriores ya están guardados.
+        # Tras cada lote guardado (y como mucho cada `checkpoint_every` páginas) se persiste el estado
+        # del crawl; con resume=True se continúa desde el último checkpoint.
+        checkpoint = CrawlCheckpoint(os.path.abspath(self.db_name), self.url)
+        state = checkpoint.load() if resume else None
+        resumed = state is not None
+        if not resumed:
+            checkpoint.clear()
+            state = CrawlState([self.url])
+        else:
+            self.logger.info (f"Reanudando crawl: {len(state.visited)} páginas ya completadas.")
+
+        stored = {"ok": True}
+        self.reset_metrics()
+
+        # Al reanudar se continúan los ficheros exportados antes del fallo en lugar de truncarlos
+        exporters = self.open_exporters(append=resumed)
+
+        def sink(records):
+            stored["ok"] = False
+            counts = self.store_records(records)
+            stored["ok"] = True
+            # Solo las páginas terminadas: todas sus citas están ya en este lote o en uno anterior
+            self.commit_http_cache(state.visited)
+            if exporters:
+                self.export_new(exporters, records, checkpoint)
+            if state.pages_since_save >= checkpoint_every:
+                checkpoint.save(state)
+            return counts
+
+        self.logger.info ("Scraping en streaming iniciado.")
+        try:
+            if concurrent:
+                counts = self.async_crawler().run_pipeline(sink, batch_size, state)
+            else:
+                counts = run_pipeline(self.iter_quotes(state), sink, batch_size)
+            self.commit_http_cache(state.visited)
+            checkpoint.clear()
+        except Exception:
+            # Si todo lo entregado quedó guardado, el estado actual es un punto de reanudación válido
+            if stored["ok"]:
+                checkpoint.save(state)
+            raise
+        finally:
+            if self.http_cache is not None:
+                self.http_cache.discard()
+            checkpoint.close()
+            self.close_exporters(exporters)
+            self.flush_metrics()
+            self.close_caches()
+        self.logger.info (f"Scraping en streaming finalizado: {counts}")
+        return counts
+
+    def export_new(self, exporters, records, checkpoint):
+        # Cada cita se exporta una vez por crawl: el checkpoint guarda en la BBDD los hashes ya exportados,
+        # así al reanudar no se repiten las citas de la página que quedó a medias (sin conjunto en memoria)
+        hashes = {}
+        for record in records:
+            hashes.setdefault(quote_hash(record['text'], record['author']), record)
+        exported = checkpoint.exported(hashes)
+        new = {content_hash: record for content_hash, record in hashes.items() if content_hash not in exported}
+        records = list(new.values())
+        for exporter in exporters:
+            exporter.write(records)
+        checkpoint.add_exported(new)
+
+    def commit_http_cache(self, urls=None):
+        if self.http_cache is not None:
+            self.http_cache.commit(urls)
+
+    def export_path(self, fmt):
+        if fmt == "excel":
+            return self.excel_path
+        return os.path.join(self.script_dir, f"quotes_db{EXPORTERS[fmt].extension}")
+
+    def open_exporters(self, append=False):
+        return [get_exporter(fmt, self.export_path(fmt), append=append) for fmt in self.exports]
+
+    def close_exporters(self, exporters):
+        for exporter in exporters:
+            exporter.close()
+            self.logger.info (f"Datos exportados ({exporter.rows} filas): {exporter.path}")
+
+    def reset_metrics(self):
+        # Las métricas (y los aciertos de la caché HTTP) de cada ejecución empiezan de cero
+        self.metrics.reset()
+        if self.http_cache is not None:
+            self.http_cache.hits = self.http_cache.misses = 0
+
+    def flush_metrics(self):
+        self.metrics.record_cache("author", self.author_cache.stats())
+        if self.http_cache is not None:
+            self.metrics.record_cache("http", self.http_cache.stats())
+        for sink in self.metrics_sinks:
+            sink.export(self.metrics)
+        self.logger.info (f"Tiempo por etapa: {self.metrics.summary()['stage_seconds']}")
+
+    def close_caches(self):
+        # Libera las conexiones SQLite de las cachés; se vuelven a abrir en la siguiente ejecución
+        self.author_cache.close()
+        if self.http_cache is not None:
+            self.http_cache.close()
+
+    def crawl_sites(self, sites, batch_size=500, max_concurrency=50):
+        # Crawl multi-sitio: `sites` son URLs iniciales o SiteConfig (extractor y límites por sitio)
+        from scheduler import CrawlScheduler
+
+        self.reset_metrics()
+        scheduler = CrawlScheduler(sites, max_concurrency=max_concurrency, rate_limiter=self.rate_limiter,
+                                   retry_policy=self.retry_policy, timeout=self.timeout, metrics=self.metrics,
+                                   parse_workers=self.parse_workers)
+        try:
+            counts = scheduler.run_pipeline(self.store_records, batch_size)
+        finally:
+            self.flush_metrics()
+            self.close_caches()
+        self.logger.info (f"Crawl multi-sitio finalizado: {counts}")
+        return counts
+
+def parse_quote_page(html, base_url):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    quotes = []
+    for quote in soup.find_all(class_='quote'):
+        text = quote.find(class_='text').get_text()
+        author = quote.find(class_='author').get_text()
+        tags = ", ".join([tag.get_text() for tag in quote.find_all(class_='tag')])
+        author_link = quote.find('a')['href']
+
+        quotes.append({
+            "text": text,
+            "author": author,
+            "tags": tags,
+            "author_url": urljoin(base_url, author_link)
+        })
+
+    next_button = soup.find(class_='next')
+    next_url = urljoin(base_url, next_button.find('a')['href']) if next_button else None
+
+    return quotes, next_url
+
+def parse_author_page(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.find(class_='author-description').get_text()
+
+def dataframe_records(df):
+    columns = zip(df['text'].tolist(), df['author'].tolist(), df['tags'].tolist(), df['about_author'].tolist())
+    return [{"text": quote_text, "author": author, "tags": tags, "about_author": about_author}
+            for quote_text, author, tags, about_author in columns]
+
 def get_logger():
-    logger = logging.getLogger()
+    # Logger propio del scraper: no se añaden handlers al logger raíz de la aplicación que lo importe
+    logger = logging.getLogger("quote_scraper")
+    logger.propagate = False
     logger.setLevel(logging.INFO)
 
     stream_handler = logging.StreamHandler()
@@ -140,9 +574,193 @@ def get_logger():
 
     return logger
 
+HASH_BYTES = 16
+
 def hash_string(input_string):
     return hashlib.md5(input_string.encode()).hexdigest()
 
+def normalize_text(value):
+    value = unicodedata.normalize("NFKC", value or "")
+    return " ".join(value.split()).casefold()
+
+def quote_hash(text, author):
+    # Identidad estable de una cita: texto y autor normalizados. Primeros 16 bytes del SHA-256
+    # (128 bits, colisiones despreciables para cualquier número realista de citas)
+    return hashlib.sha256(f"{normalize_text(text)}\x1f{normalize_text(author)}".encode()).digest()[:HASH_BYTES]
+
+@contextmanager
+def schema_transaction(engine):
+    # pysqlite no abre transacción antes de un ALTER/CREATE, así que cada DDL se confirma por su cuenta
+    # y un fallo posterior deja el esquema a medias. Con BEGIN explícito (driver en modo autocommit)
+    # DDL y DML van en una sola transacción: o se aplica la migración entera o nada.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+
+def migrate_quotes_table(engine):
+    # BBDD creadas antes de content_hash: añade la columna, la rellena,
+    # elimina los duplicados acumulados y crea el índice único.
+    columns = [column["name"] for column in inspect(engine).get_columns("quotes")]
+    if "content_hash" in columns:
+        migrate_hex_hashes(engine)
+        return
+
+    with schema_transaction(engine) as conn:
+        conn.execute(text("ALTER TABLE quotes ADD COLUMN content_hash BLOB"))
+        rows = conn.execute(text("SELECT id, text, author FROM quotes ORDER BY id")).fetchall()
+
+        seen = set()
+        for quote_id, quote_text, author in rows:
+            content_hash = quote_hash(quote_text, author)
+            if content_hash in seen:
+                conn.execute(text("DELETE FROM quotes WHERE id = :id"), {"id": quote_id})
+            else:
+                seen.add(content_hash)
+                conn.execute(text("UPDATE quotes SET content_hash = :hash WHERE id = :id"),
+                             {"hash": content_hash, "id": quote_id})
+
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_quotes_content_hash ON quotes (content_hash)"))
+
+def migrate_hex_hashes(engine):
+    # BBDD con content_hash en hex (SHA-256 completo, 64 caracteres): pasa a los 16 bytes de quote_hash,
+    # que son el prefijo del mismo digest, sin recalcular nada. En SQLite el texto ordena antes que los
+    # BLOB, así que el primer valor del índice único dice si queda alguno en hex sin recorrer la tabla.
+    with engine.connect() as conn:
+        first = conn.execute(text("SELECT typeof(content_hash) FROM quotes WHERE content_hash IS NOT NULL "
+                                  "ORDER BY content_hash LIMIT 1")).scalar()
+    if first != "text":
+        return
+    with schema_transaction(engine) as conn:
+        rows = conn.execute(text("SELECT id, content_hash FROM quotes WHERE typeof(content_hash) = 'text'"))
+        conn.execute(text("UPDATE quotes SET content_hash = :hash WHERE id = :id"),
+                     [{"id": quote_id, "hash": bytes.fromhex(value)[:HASH_BYTES]} for quote_id, value in rows])
+
+def author_slug(name):
+    # "J.K. Rowling" -> "j-k-rowling" (mismo esquema que las URLs /author/<slug> de quotes.toscrape.com)
+    return re.sub(r"[^\w]+", "-", normalize_text(name or "")).strip("-") or "unknown"
+
+def upsert_authors(conn, authors):
+    # authors: [{"slug", "name", "about"}]. Devuelve {slug: id}; una biografía vacía no pisa la guardada.
+    ids = {}
+    if not authors:
+        return ids
+    stmt = sqlite_insert(Author.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["slug"],
+        set_={"name": stmt.excluded.name, "about": func.coalesce(stmt.excluded.about, Author.__table__.c.about)},
+        where=func.coalesce(stmt.excluded.about, Author.__table__.c.about).is_distinct_from(Author.__table__.c.about),
+    )
+    conn.execute(stmt, authors)
+    slugs = [author["slug"] for author in authors]
+    for i in range(0, len(slugs), 500):
+        for row in conn.execute(select(Author.id, Author.slug).where(Author.slug.in_(slugs[i:i + 500]))):
+            ids[row.slug] = row.id
+    return ids
+
+def migrate_authors_table(engine):
+    # BBDD anteriores a la tabla authors: mueve las biografías (una por autor), enlaza las citas
+    # por author_id y elimina about_author de quotes. La vista quotes_flat conserva la forma plana.
+    columns = [column["name"] for column in inspect(engine).get_columns("quotes")]
+    pending = "about_author" in columns and "author_id" not in columns
+    if "about_author" in columns and not pending:
+        # Migración anterior sin DROP COLUMN: solo queda trabajo si hay biografías sin mover
+        with engine.connect() as conn:
+            pending = conn.execute(text("SELECT 1 FROM quotes WHERE about_author IS NOT NULL LIMIT 1")).first() is not None
+    if pending:
+        with schema_transaction(engine) as conn:
+            if "author_id" not in columns:
+                conn.execute(text("ALTER TABLE quotes ADD COLUMN author_id INTEGER REFERENCES authors (id)"))
+            authors, names = {}, {}
+            for name, about in conn.execute(text("SELECT author, about_author FROM quotes ORDER BY id")):
+                slug = author_slug(name)
+                names[name] = slug
+                if about or slug not in authors:
+                    authors[slug] = {"slug": slug, "name": name, "about": about}
+            author_ids = upsert_authors(conn, list(authors.values()))
+            if names:
+                # Un solo UPDATE con una tabla temporal nombre -> author_id (clave primaria indexada): un UPDATE
+                # por autor recorrería quotes entera cada vez. authors.name no vale: nombres con el mismo slug
+                # ("J.K. Rowling", "J. K. Rowling") comparten autor. Con la tabla vacía no hay nada que enlazar.
+                conn.execute(text("CREATE TEMP TABLE author_names (name TEXT PRIMARY KEY, author_id INTEGER)"))
+                conn.execute(text("INSERT INTO author_names (name, author_id) VALUES (:name, :author_id)"),
+                             [{"author_id": author_ids[slug], "name": name} for name, slug in names.items()])
+                conn.execute(text("UPDATE quotes SET author_id = "
+                                  "(SELECT author_id FROM author_names WHERE author_names.name IS quotes.author)"))
+                conn.execute(text("DROP TABLE temp.author_names"))
+            try:
+                conn.execute(text("ALTER TABLE quotes DROP COLUMN about_author"))
+            except OperationalError:
+                # SQLite < 3.35 no tiene DROP COLUMN: se vacía la columna
+                conn.execute(text("UPDATE quotes SET about_author = NULL"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_quotes_author_id ON quotes (author_id)"))
+        # Recupera el espacio que ocupaban las biografías repetidas
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE VIEW IF NOT EXISTS quotes_flat AS "
+            "SELECT q.id, q.text, q.author, q.tags, a.about AS about_author, q.content_hash "
+            "FROM quotes AS q LEFT JOIN authors AS a ON a.id = q.author_id"
+        ))
+
+def setup_schema(engine):
+    Base.metadata.create_all(engine)
+    migrate_quotes_table(engine)
+    migrate_authors_table(engine)
+    migrate_tag_index(engine)
+    create_search_index(engine)
+
+def split_tags(tags):
+    # "Inspirational, life ,life" -> ["inspirational", "life"]
+    names = []
+    for tag in (tags or "").split(","):
+        name = tag.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def sync_tags(conn, association, rows, replace=True):
+    # Actualiza el índice de etiquetas para [(quote_id, "tag1, tag2")] dentro de la transacción en curso.
+    # `conn` puede ser una Session o una Connection; con replace=False se asume que las citas son nuevas.
+    tags_by_quote = {quote_id: split_tags(tags) for quote_id, tags in rows}
+    quote_ids = list(tags_by_quote)
+    if replace:
+        for i in range(0, len(quote_ids), 500):
+            conn.execute(delete(association).where(association.c.quote_id.in_(quote_ids[i:i + 500])))
+
+    names = sorted({name for names in tags_by_quote.values() for name in names})
+    if not names:
+        return
+    conn.execute(sqlite_insert(Tag.__table__).on_conflict_do_nothing(), [{"name": name} for name in names])
+    tag_ids = {}
+    for i in range(0, len(names), 500):
+        for row in conn.execute(select(Tag.id, Tag.name).where(Tag.name.in_(names[i:i + 500]))):
+            tag_ids[row.name] = row.id
+    conn.execute(insert(association), [{"quote_id": quote_id, "tag_id": tag_ids[name]}
+                                      for quote_id, names in tags_by_quote.items() for name in names])
+
+def migrate_tag_index(engine, chunk_size=5000):
+    # BBDD anteriores al índice de etiquetas: lo rellena a partir de la columna tags
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_quotes_author ON quotes (author)"))
+        for table, association in ((Quote.__table__, quote_tags), (Quote_internet.__table__, quote_internet_tags)):
+            if conn.execute(select(association.c.quote_id).limit(1)).first() is not None:
+                continue
+            last_id = 0
+            while True:
+                rows = conn.execute(select(table.c.id, table.c.tags).where(table.c.id > last_id)
+                                    .order_by(table.c.id).limit(chunk_size)).fetchall()
+                if not rows:
+                    break
+                sync_tags(conn, association, rows, replace=False)
+                last_id = rows[-1].id
+
 if __name__ == "__main__":
     scraper = QuoteScraper("https://quotes.toscrape.com/")
     result_df = scraper.run()
@@ -150,7 +768,8 @@ if __name__ == "__main__":
     print("\nDataset Statistics:")
     print(f"Total Quotes: {len(result_df)}")
     print(f"Unique Authors: {result_df['author'].nunique()}")
-    print(f"Total Tags: {result_df['tags'].str.split(', ').explode().nunique()}")
+    with scraper.engine.connect() as conn:
+        print(f"Total Tags: {conn.execute(select(func.count()).select_from(Tag.__table__)).scalar()}")
 
     db_path = os.path.abspath(scraper.db_name)
     if os.path.exists(db_path):
@@ -0,0 +1,60 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from extractors import get_extractor
+
+# Etapa de parseo en procesos: el HTML descargado se envía a un pool de workers y estos devuelven
+# dicts planos (citas, descripción de autor, enlace a la página siguiente), así el parseo no compite
+# por el GIL con las descargas. Las páginas de listado se parsean de una en una (cada una trae el enlace a la
+# siguiente), así que no hay lotes que repartir con executor.map: cada página es una tarea del pool.
+# El extractor se indica por tarea (por defecto el del pool) para que varios crawlers compartan un pool.
+
+_extractors = {}
+
+
+def _worker_extractor(name):
+    # Cada proceso construye su extractor una sola vez (las XPath compiladas no se pueden serializar)
+    if name not in _extractors:
+        _extractors[name] = get_extractor(name)
+    return _extractors[name]
+
+
+def _decode(body):
+    return body.decode("utf-8", errors="replace") if isinstance(body, bytes) else body
+
+
+def parse_listing_page(url, body, extractor="soup"):
+    quotes, next_url = _worker_extractor(extractor).parse_quote_page(_decode(body), url)
+    return {"url": url, "quotes": quotes, "next_url": next_url}
+
+
+def parse_author_page(url, body, extractor="soup"):
+    return {"url": url, "about_author": _worker_extractor(extractor).parse_author_page(_decode(body))}
+
+
+class ParsePool:
+    def __init__(self, workers=None, extractor="soup"):
+        self.workers = workers or os.cpu_count() or 1
+        self.extractor = extractor
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit_listing(self, url, body, extractor=None):
+        return self.executor.submit(parse_listing_page, url, body, extractor or self.extractor)
+
+    def submit_author(self, url, body, extractor=None):
+        return self.executor.submit(parse_author_page, url, body, extractor or self.extractor)
+
+    async def parse_listing_async(self, url, body, extractor=None):
+        return await asyncio.wrap_future(self.submit_listing(url, body, extractor))
+
+    async def parse_author_async(self, url, body, extractor=None):
+        return await asyncio.wrap_future(self.submit_author(url, body, extractor))
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,62 @@
+import asyncio
+
+# Pipeline por lotes: fuente de registros (generador) -> lotes -> sink.
+# La sink recibe una lista de dicts y devuelve un dict de contadores, p. ej. QuoteScraper.store_records.
+
+
+def batched(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def merge_counts(totals, counts):
+    for key, value in (counts or {}).items():
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def run_pipeline(records, sink, batch_size=500):
+    totals = {}
+    batch = []
+    try:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                pending, batch = batch, []
+                merge_counts(totals, sink(pending))
+    except Exception:
+        # Si la fuente falla a mitad del crawl, lo ya recibido se persiste antes de propagar el error
+        if batch:
+            merge_counts(totals, sink(batch))
+        raise
+
+    if batch:
+        merge_counts(totals, sink(batch))
+    return totals
+
+
+async def run_pipeline_async(records, sink, batch_size=500):
+    # Igual que run_pipeline, pero la fuente es un generador asíncrono y la sink (bloqueante)
+    # se ejecuta en un hilo para no detener las descargas en curso.
+    totals = {}
+    batch = []
+    try:
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                pending, batch = batch, []
+                merge_counts(totals, await asyncio.to_thread(sink, pending))
+    except Exception:
+        if batch:
+            merge_counts(totals, await asyncio.to_thread(sink, batch))
+        raise
+
+    if batch:
+        merge_counts(totals, await asyncio.to_thread(sink, batch))
+    return totals
@@ -0,0 +1,105 @@
+import math
+import re
+
+# Serialización compacta de las citas candidatas para el prompt del recomendador. Cada cita va en una línea
+# "id|autor|etiquetas|texto" con un id corto (su posición), el modelo responde solo con ids y las citas
+# completas se reconstruyen en local. DataFrame.to_string rellena cada columna con espacios hasta el ancho
+# de la más larga: con textos largos, la mayor parte de los tokens del prompt eran espacios.
+
+# Presupuesto total del prompt (sistema + instrucciones + citas), por debajo del contexto del modelo (8192)
+DEFAULT_TOKEN_BUDGET = 3000
+
+# Valores de ejemplo para medir el coste fijo de la plantilla
+TEMPLATE_SAMPLE = {"user_input": "", "n": 10, "quotes": ""}
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]| {2,}|\s")
+
+
+def estimate_tokens(text):
+    # Estimación local del número de tokens (sin tokenizador del modelo): las palabras cortas cuentan uno y
+    # las largas uno por cada ~6 caracteres; cada signo, uno; los tramos de espacios, uno por cada 4 espacios
+    # (los tokenizadores BPE agrupan los espacios, pero no sin límite). Tiende a sobrestimar, que es lo seguro.
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if piece[0].isspace():
+            tokens += 0 if piece == " " else math.ceil(len(piece) / 4)
+        elif piece[0].isalnum() or piece[0] == "_":
+            tokens += 1 + (len(piece) - 1) // 6
+        else:
+            tokens += 1
+    return tokens
+
+
+def _field(value):
+    # Una cita por línea: sin saltos de línea ni separadores dentro de los campos
+    return " ".join(str(value or "").replace("|", "/").split())
+
+
+def quote_line(quote_id, record):
+    tags = ",".join(tag.strip() for tag in str(record.get("tags") or "").split(",") if tag.strip())
+    return f"{quote_id}|{_field(record.get('author'))}|{_field(tags)}|{_field(record.get('text'))}"
+
+
+def serialize_quotes(records, max_tokens):
+    # Líneas "id|autor|etiquetas|texto" en orden (el más relevante primero) mientras quepan en max_tokens.
+    # Devuelve (texto, ids incluidos); el id es la posición (1, 2, ...) en `records`.
+    lines, ids, used = [], [], 0
+    for quote_id, record in enumerate(records, start=1):
+        line = quote_line(quote_id, record)
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        lines.append(line)
+        ids.append(quote_id)
+        used += cost
+    return "\n".join(lines), ids
+
+
+def build_prompt_values(template_messages, user_input, n, records, token_budget=DEFAULT_TOKEN_BUDGET):
+    # Valores para la plantilla del prompt: las citas ocupan lo que deja libre la parte fija
+    fixed = sum(estimate_tokens(message.format(**dict(TEMPLATE_SAMPLE, user_input=user_input, n=n)))
+                for message in template_messages)
+    if fixed >= token_budget:
+        raise ValueError(f"El presupuesto de {token_budget} tokens no alcanza para las instrucciones ({fixed})")
+    quotes, ids = serialize_quotes(records, token_budget - fixed)
+    return {"quotes": quotes, "user_input": user_input, "n": n}, ids
+
+
+class IdStreamParser:
+    # Lee los ids de la respuesta a trozos (streaming): un id está completo cuando llega el carácter siguiente
+    # a su último dígito (o termina la respuesta). Descarta repetidos e inventados y se detiene en n.
+    def __init__(self, valid_ids, n):
+        self.valid = set(valid_ids)
+        self.n = n
+        self.selected = []
+        self._digits = ""
+
+    @property
+    def done(self):
+        return len(self.selected) >= self.n
+
+    def _accept(self):
+        quote_id = int(self._digits) if self._digits else None
+        self._digits = ""
+        if quote_id in self.valid and quote_id not in self.selected and not self.done:
+            self.selected.append(quote_id)
+            return [quote_id]
+        return []
+
+    def feed(self, text):
+        completed = []
+        for char in text:
+            if "0" <= char <= "9":
+                self._digits += char
+            elif self._digits:
+                completed += self._accept()
+        return completed
+
+    def close(self):
+        return self._accept()
+
+
+def parse_ids(response, valid_ids, n):
+    # Ids de la respuesta del modelo, sin repetidos ni inventados, como mucho n
+    parser = IdStreamParser(valid_ids, n)
+    return parser.feed(response) + parser.close()
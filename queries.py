@@ -0,0 +1,158 @@
+import os
+import pandas as pd
+from sqlalchemy import column, func, select, table as table_clause
+from oop_scraper import Quote, Quote_internet, Tag, quote_internet_tags, quote_tags, split_tags
+
+# Capa de acceso a datos: consultas por etiqueta y autor resueltas en SQLite con el índice de etiquetas
+# y páginas por keyset (id > último id visto) con proyección de columnas y filtros,
+# sin cargar la tabla completa en un DataFrame.
+
+TABLES = {
+    "quotes": (Quote.__table__, quote_tags),
+    "quotes_internet": (Quote_internet.__table__, quote_internet_tags),
+}
+
+
+# Columnas que se pueden mostrar de cada tabla. Las citas se leen de la vista quotes_flat (incluye la biografía).
+BROWSE_COLUMNS = {
+    "quotes": ("id", "text", "author", "tags", "about_author"),
+    "quotes_internet": ("id", "text", "author", "tags", "source"),
+}
+BROWSE_SOURCES = {"quotes": "quotes_flat", "quotes_internet": "quotes_internet"}
+# Columnas que solo están en la vista (JOIN con authors). Si no se piden se lee la tabla directamente:
+# el JOIN es la parte más cara de una lectura completa (ver benchmarks/bench_store.py).
+VIEW_ONLY_COLUMNS = {"quotes": ("about_author",)}
+
+
+def _tables(table):
+    if table not in TABLES:
+        raise ValueError(f"Tabla desconocida: {table}. Opciones: {', '.join(TABLES)}")
+    return TABLES[table]
+
+
+def read_frame(engine, query):
+    # Equivalente a pd.read_sql_query sin depender de la versión de SQLAlchemy que acepte pandas
+    with engine.connect() as conn:
+        result = conn.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+def quotes_by_tags(engine, tags, match_all=False, limit=100, offset=0, table="quotes"):
+    # tags: lista o cadena "tag1, tag2". match_all=True exige todas las etiquetas; si no, basta una.
+    quotes, association = _tables(table)
+    names = split_tags(", ".join(tags) if isinstance(tags, (list, tuple, set)) else tags)
+    matching = (
+        select(association.c.quote_id)
+        .join(Tag.__table__, Tag.id == association.c.tag_id)
+        .where(Tag.name.in_(names))
+        .group_by(association.c.quote_id)
+    )
+    if match_all:
+        matching = matching.having(func.count() == len(names))
+    query = (
+        select(quotes.c.id, quotes.c.text, quotes.c.author, quotes.c.tags)
+        .where(quotes.c.id.in_(matching))
+        .order_by(quotes.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return read_frame(engine, query)
+
+
+def quotes_by_author(engine, author, limit=100, offset=0, table="quotes"):
+    quotes, _ = _tables(table)
+    query = (
+        select(quotes.c.id, quotes.c.text, quotes.c.author, quotes.c.tags)
+        .where(quotes.c.author == author)
+        .order_by(quotes.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return read_frame(engine, query)
+
+
+def quotes_by_ids(engine, ids, table="quotes"):
+    # Citas con esos ids en el mismo orden (los que ya no existen se omiten)
+    quotes, _ = _tables(table)
+    ids = [int(quote_id) for quote_id in ids]
+    frames = [read_frame(engine, select(quotes.c.id, quotes.c.text, quotes.c.author, quotes.c.tags)
+                         .where(quotes.c.id.in_(ids[i:i + 500]))) for i in range(0, len(ids), 500)]
+    if not frames:
+        return pd.DataFrame(columns=["id", "text", "author", "tags"])
+    found = pd.concat(frames).set_index("id")
+    return found.reindex([quote_id for quote_id in ids if quote_id in found.index]).reset_index()
+
+
+def tag_counts(engine, limit=None, table="quotes"):
+    # Número de citas por etiqueta, de más a menos frecuente
+    _, association = _tables(table)
+    count = func.count(association.c.quote_id).label("count")
+    query = (
+        select(Tag.name.label("tag"), count)
+        .join(association, association.c.tag_id == Tag.id)
+        .group_by(Tag.id)
+        .order_by(count.desc(), Tag.name)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return read_frame(engine, query)
+
+
+def _browse_query(table, columns, author=None, tag=None):
+    if table not in BROWSE_COLUMNS:
+        raise ValueError(f"Tabla desconocida: {table}. Opciones: {', '.join(BROWSE_COLUMNS)}")
+    available = BROWSE_COLUMNS[table]
+    columns = list(columns or available)
+    unknown = [name for name in columns if name not in available]
+    if unknown:
+        raise ValueError(f"Columnas desconocidas: {', '.join(unknown)}. Opciones: {', '.join(available)}")
+    if "id" not in columns:
+        # El id hace falta para la paginación por keyset
+        columns.insert(0, "id")
+
+    view_only = VIEW_ONLY_COLUMNS.get(table, ())
+    if any(name in view_only for name in columns):
+        source = table_clause(BROWSE_SOURCES[table], *(column(name) for name in available))
+    else:
+        source = table_clause(table, *(column(name) for name in available if name not in view_only))
+    conditions = []
+    if author:
+        conditions.append(source.c.author == author)
+    if tag:
+        _, association = _tables(table)
+        conditions.append(source.c.id.in_(
+            select(association.c.quote_id)
+            .join(Tag.__table__, Tag.id == association.c.tag_id)
+            .where(Tag.name.in_(split_tags(tag)))
+        ))
+    return source, columns, conditions
+
+
+def fetch_page(engine, table="quotes", columns=None, after_id=0, limit=100, author=None, tag=None):
+    # Página de `limit` filas con id > after_id. La siguiente página empieza en el último id devuelto,
+    # así cada página cuesta lo mismo aunque la tabla tenga millones de filas (OFFSET recorrería las anteriores).
+    source, columns, conditions = _browse_query(table, columns, author, tag)
+    query = (
+        select(*(source.c[name] for name in columns))
+        .where(source.c.id > after_id, *conditions)
+        .order_by(source.c.id)
+        .limit(limit)
+    )
+    return read_frame(engine, query)
+
+
+def count_rows(engine, table="quotes", author=None, tag=None):
+    source, _, conditions = _browse_query(table, ["id"], author, tag)
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(source).where(*conditions)).scalar()
+
+
+def db_version(db_path):
+    # Cambia con cada escritura (en modo WAL las escrituras llegan antes al fichero -wal).
+    # Sirve como clave de caché: al cambiar, las consultas cacheadas dejan de usarse.
+    version = []
+    for path in (db_path, db_path + "-wal"):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
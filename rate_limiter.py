@@ -0,0 +1,165 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    # Reintentos con backoff exponencial y jitter completo (delay aleatorio entre 0 y base * 2^intento)
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=30, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+
+    def should_retry(self, status, attempt):
+        # status None = error de conexión o timeout
+        return attempt < self.max_retries and (status is None or status in self.retry_statuses)
+
+    def delay(self, attempt, retry_after=None):
+        backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.backoff_max))
+        return backoff
+
+
+class HostLimiter:
+    # Token bucket por host con tasa y concurrencia adaptativas (AIMD):
+    # sube poco a poco con respuestas sanas y se reduce a la mitad ante 429/5xx, errores o picos de latencia.
+    def __init__(self, rate=10.0, min_rate=0.5, max_rate=50.0, burst=10, concurrency=4, max_concurrency=16,
+                 rate_increase=1.0, decrease_factor=0.5, latency_spike=3.0, latency_floor=0.25):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.rate_increase = rate_increase
+        self.decrease_factor = decrease_factor
+        self.latency_spike = latency_spike
+        self.latency_floor = latency_floor
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency = None
+        self.inflight = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # Consume un token y devuelve cuántos segundos hay que esperar antes de enviar la petición
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def on_response(self, status, latency, retry_after=None):
+        with self.lock:
+            # Pico: latencia muy por encima de la media (y de un umbral mínimo, para no reaccionar a ruido en ms)
+            spike = self.latency is not None and latency > max(self.latency * self.latency_spike, self.latency_floor)
+            if status is None or status in RETRY_STATUSES or spike:
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+                self.tokens = min(self.tokens, 0.0)
+                if retry_after:
+                    self.blocked_until = time.monotonic() + retry_after
+            else:
+                self.rate = min(self.max_rate, self.rate + self.rate_increase)
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+            if status is not None and not spike:
+                # Media móvil de la latencia "normal" para detectar picos
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+
+
+class RateLimiter:
+    def __init__(self, **host_settings):
+        self.host_settings = host_settings
+        self.hosts = {}
+        # Bucle de eventos -> {host: asyncio.Condition}: cada crawl async usa su propio asyncio.run
+        self._conditions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        netloc = urlparse(url).netloc
+        with self._lock:
+            if netloc not in self.hosts:
+                self.hosts[netloc] = HostLimiter(**self.host_settings)
+            return self.hosts[netloc]
+
+    @contextmanager
+    def acquire(self, url):
+        host = self.host(url)
+        wait = host.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        host.inflight += 1
+        try:
+            yield host
+        finally:
+            host.inflight -= 1
+
+    def _condition(self, netloc):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            conditions = self._conditions.get(loop)
+            if conditions is None:
+                # Una Condition que ha esperado guarda una referencia a su bucle y la clave débil no basta:
+                # los bucles ya cerrados se eliminan al registrar uno nuevo
+                for closed in [other for other in list(self._conditions) if other.is_closed()]:
+                    del self._conditions[closed]
+                conditions = self._conditions[loop] = {}
+            if netloc not in conditions:
+                conditions[netloc] = asyncio.Condition()
+            return conditions[netloc]
+
+    @asynccontextmanager
+    async def acquire_async(self, url):
+        host = self.host(url)
+        condition = self._condition(urlparse(url).netloc)
+
+        async with condition:
+            await condition.wait_for(lambda: host.inflight < host.concurrency)
+            host.inflight += 1
+        try:
+            wait = host.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield host
+        finally:
+            async with condition:
+                host.inflight -= 1
+                condition.notify_all()
+
+    def record(self, url, status, latency, retry_after=None):
+        self.host(url).on_response(status, latency, retry_after)
+
+    def stats(self):
+        return {
+            netloc: {"rate": round(host.rate, 2), "concurrency": host.concurrency, "throttled": host.throttled}
+            for netloc, host in self.hosts.items()
+        }
+
+
+def parse_retry_after(value):
+    # Retry-After puede venir en segundos o como fecha HTTP
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_query(query):
+    # "  Frases   MOTIVADORAS! " y "frases motivadoras" son la misma consulta
+    query = unicodedata.normalize("NFKC", query).lower()
+    return " ".join(re.findall(r"\w+", query))
+
+
+def cache_key(query, n, model, corpus_version):
+    payload = json.dumps([normalize_query(query), int(n), model, corpus_version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    # Caché de respuestas del recomendador (valores serializables en JSON). En memoria con expulsión LRU;
+    # con db_path también en SQLite, para conservarlas entre reinicios. ttl (segundos) caduca ambas.
+    def __init__(self, db_path=None, max_entries=512, ttl=None):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._memory[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT value, created FROM response_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    entry = (json.loads(row[0]), row[1])
+                    self._remember(key, *entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        created = time.time()
+        with self._lock:
+            self._remember(key, value, created)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), created),
+                )
+                if self.ttl is not None:
+                    self._conn.execute("DELETE FROM response_cache WHERE created < ?", (created - self.ttl,))
+                self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM response_cache")
+                self._conn.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,75 @@
+import re
+import pandas as pd
+from sqlalchemy.exc import OperationalError
+from queries import fetch_page, quotes_by_ids
+from search import search_quotes
+
+# Preselección local para el recomendador: en vez de mandar toda la tabla al LLM se envían solo las k citas
+# más relevantes para la consulta según BM25 sobre el índice FTS5 (texto, autor y etiquetas). El índice se
+# mantiene al escribir (index_new_rows y triggers), así que el coste por consulta no crece con la tabla.
+# Con un índice vectorial (vectors.VectorIndex) se combinan ambas listas para encontrar también citas
+# parecidas aunque no compartan palabras exactas con la consulta (raíces comunes con el embedder por defecto;
+# significado solo con un embedder como SentenceTransformerEmbedder).
+
+DEFAULT_TOP_K = 40
+CANDIDATES_PER_QUOTE = 5
+
+# Constante de Reciprocal Rank Fusion: cada lista aporta 1 / (RRF_K + posición)
+RRF_K = 60
+
+COLUMNS = ["id", "text", "author", "tags", "score"]
+
+# Palabras vacías (español e inglés) que no aportan nada a la búsqueda y con OR coincidirían con casi todo
+STOPWORDS = frozenset("""
+    the and for with that this from are was you your about some quotes quote want need give show
+    los las una unos unas del con por para que como sus sobre frase frases cita citas quiero dame
+    busco algo muy mas más este esta estos estas ese esa
+""".split())
+
+
+def query_terms(query):
+    return [word for word in re.findall(r"\w+", query.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+
+def shortlist_size(n, top_k=None):
+    # Margen suficiente para que el modelo elija n citas entre varias opciones
+    return top_k if top_k is not None else max(DEFAULT_TOP_K, CANDIDATES_PER_QUOTE * int(n))
+
+
+def keyword_candidates(engine, query, k=DEFAULT_TOP_K, table="quotes"):
+    terms = query_terms(query)
+    if terms:
+        try:
+            return search_quotes(engine, " ".join(terms), mode="any", limit=k, table=table)
+        except OperationalError:
+            # Sin FTS5 no hay índice: se usa el respaldo
+            pass
+    return pd.DataFrame(columns=COLUMNS)
+
+
+def fuse_rankings(rankings, k):
+    # Reciprocal Rank Fusion: no necesita que las puntuaciones (BM25, coseno) sean comparables
+    scores = {}
+    for ranking in rankings:
+        for position, quote_id in enumerate(ranking):
+            scores[quote_id] = scores.get(quote_id, 0.0) + 1.0 / (RRF_K + position + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def top_k_candidates(engine, query, k=DEFAULT_TOP_K, table="quotes", vector_index=None):
+    # DataFrame id, text, author, tags, score con como mucho k citas, de más a menos relevante
+    # (score: BM25 o, con vector_index, -RRF; en ambos casos menor = mejor).
+    # Si ninguna coincide (p. ej. consulta en otro idioma) devuelve las k primeras para que el modelo elija.
+    if vector_index is not None and vector_index.table != table:
+        raise ValueError(f"El índice vectorial es de la tabla {vector_index.table}, no de {table}")
+    candidates = keyword_candidates(engine, query, k, table)
+    if vector_index is not None and len(vector_index):
+        semantic_ids, _ = vector_index.search([query], k)
+        fused = fuse_rankings([candidates["id"].tolist(), semantic_ids[0].tolist()], k)
+        scores = {quote_id: -score for quote_id, score in fused}
+        candidates = quotes_by_ids(engine, list(scores), table)
+        candidates["score"] = candidates["id"].map(scores)
+    if candidates.empty:
+        candidates = fetch_page(engine, table, ["id", "text", "author", "tags"], limit=k)
+        candidates["score"] = None
+    return candidates[COLUMNS].reset_index(drop=True)
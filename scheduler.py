@@ -0,0 +1,138 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+import pandas as pd
+from async_crawler import AsyncQuoteCrawler
+from parse_pool import ParsePool
+from pipeline import run_pipeline_async
+from rate_limiter import RateLimiter, RetryPolicy
+
+
+class SiteConfig:
+    # Semilla del crawl multi-sitio: URL inicial, backend de extracción y límites propios del host
+    def __init__(self, start_url, extractor=None, priority=0, max_per_host=4, max_pending_pages=4):
+        self.start_url = start_url
+        self.extractor = extractor
+        self.priority = priority
+        self.max_per_host = max_per_host
+        self.max_pending_pages = max_pending_pages
+
+    @property
+    def host(self):
+        return urlparse(self.start_url).netloc
+
+
+class PrioritySlots:
+    # Límite global de peticiones en curso. Cuando se libera un hueco se concede a la petición de
+    # mayor prioridad (número menor) y, a igualdad, al host al que menos se ha servido: así los
+    # hosts se intercalan y uno lento no acapara la capacidad del resto.
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self.served = {}
+        self._waiters = []
+        self._counter = itertools.count()
+
+    @asynccontextmanager
+    async def acquire(self, host, priority=0):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, self.served.get(host, 0), next(self._counter), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        self.served[host] = self.served.get(host, 0) + 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        while self._waiters:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.cancelled():
+                # El hueco pasa directamente al siguiente en espera
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class CrawlScheduler:
+    def __init__(self, sites, max_concurrency=50, rate_limiter=None, retry_policy=None, timeout=(5, 30),
+                 queue_size=1000, metrics=None, parse_workers=0):
+        self.sites = [site if isinstance(site, SiteConfig) else SiteConfig(site) for site in sites]
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.metrics = metrics
+        # parse_workers > 0: un solo pool de procesos para todos los sitios (cada tarea lleva su extractor)
+        self.parse_workers = parse_workers
+
+    def crawler(self, site, slots, parse_pool=None):
+        # Un crawler (con su propio pool de conexiones) por sitio; todos comparten el límite global
+        return AsyncQuoteCrawler(
+            site.start_url,
+            max_concurrency=site.max_per_host,
+            max_per_host=site.max_per_host,
+            timeout=self.timeout,
+            extractor=site.extractor,
+            max_pending_pages=site.max_pending_pages,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            request_slot=lambda url: slots.acquire(urlparse(url).netloc, site.priority),
+            metrics=self.metrics,
+            parse_pool=parse_pool,
+        )
+
+    async def iter_quotes(self):
+        # Las citas de todos los sitios se mezclan en una cola acotada según van llegando
+        slots = PrioritySlots(self.max_concurrency)
+        queue = asyncio.Queue(self.queue_size)
+        done = object()
+        parse_pool = ParsePool(self.parse_workers) if self.parse_workers else None
+
+        async def crawl_site(site):
+            try:
+                async for quote in self.crawler(site, slots, parse_pool).iter_quotes():
+                    quote["site"] = site.start_url
+                    await queue.put(quote)
+            finally:
+                await queue.put(done)
+
+        tasks = [asyncio.create_task(crawl_site(site)) for site in self.sites]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+            # Propaga el primer error de un sitio (los demás ya habrán terminado)
+            for task in tasks:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if parse_pool is not None:
+                # Cancela los parseos pendientes; las tareas canceladas ya no los esperan
+                parse_pool.close()
+
+    async def crawl(self):
+        quotes_data = [quote async for quote in self.iter_quotes()]
+        return pd.DataFrame(quotes_data, columns=["text", "author", "tags", "about_author", "site"])
+
+    def run(self):
+        return asyncio.run(self.crawl())
+
+    def run_pipeline(self, sink, batch_size=500):
+        return asyncio.run(run_pipeline_async(self.iter_quotes(), sink, batch_size))
@@ -0,0 +1,120 @@
+import re
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Búsqueda de texto completo con SQLite FTS5. Cada tabla de citas tiene una tabla virtual
+# de contenido externo (solo guarda el índice invertido). UPDATE (upsert) y DELETE se sincronizan
+# con triggers; las inserciones se indexan por lotes con index_new_rows, porque un trigger
+# AFTER INSERT hace la carga masiva unas cinco veces más lenta.
+
+FTS_TABLES = {
+    "quotes": "quotes_fts",
+    "quotes_internet": "quotes_internet_fts",
+}
+
+# Pesos BM25 de las columnas indexadas: texto, autor, etiquetas
+WEIGHTS = (10.0, 5.0, 2.0)
+
+MODES = ("words", "prefix", "phrase", "any", "raw")
+
+
+def _fts_table(table):
+    if table not in FTS_TABLES:
+        raise ValueError(f"Tabla desconocida: {table}. Opciones: {', '.join(FTS_TABLES)}")
+    return FTS_TABLES[table]
+
+
+def create_search_index(engine):
+    # Crea las tablas FTS5 y sus triggers si no existen y las rellena con las citas que aún no estén indexadas
+    created = []
+    with engine.begin() as conn:
+        for table, fts in FTS_TABLES.items():
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                  {"name": fts}).first()
+            if exists:
+                # Filas insertadas sin pasar por index_new_rows (otro proceso, versiones anteriores...)
+                last_indexed = conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {fts}_docsize")).scalar()
+                conn.execute(text(_index_sql(table, fts)), {"after_id": last_indexed})
+                continue
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5(text, author, tags, content='{table}', "
+                    f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                ))
+            except OperationalError as e:
+                # SQLite compilado sin FTS5: la búsqueda queda deshabilitada
+                if "fts5" in str(e):
+                    return created
+                raise
+            conn.execute(text(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, text, author, tags)
+                    VALUES ('delete', old.id, old.text, old.author, old.tags);
+                END"""))
+            conn.execute(text(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF text, author, tags ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, text, author, tags)
+                    VALUES ('delete', old.id, old.text, old.author, old.tags);
+                    INSERT INTO {fts} (rowid, text, author, tags) VALUES (new.id, new.text, new.author, new.tags);
+                END"""))
+            conn.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+            created.append(fts)
+    return created
+
+
+def _index_sql(table, fts):
+    return f"INSERT INTO {fts} (rowid, text, author, tags) SELECT id, text, author, tags FROM {table} WHERE id > :after_id"
+
+
+def index_new_rows(conn, table="quotes", after_id=0):
+    # Indexa las citas con id > after_id dentro de la transacción en curso (Session o Connection)
+    fts = _fts_table(table)
+    exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                          {"name": fts}).first()
+    if exists:
+        conn.execute(text(_index_sql(table, fts)), {"after_id": after_id})
+
+
+def match_expression(query, mode="words"):
+    # Convierte lo que escribe el usuario en una expresión MATCH segura:
+    #   words  -> todas las palabras, en cualquier orden
+    #   prefix -> todas las palabras, la última (o cada una) como prefijo: "imag" encuentra "imagination"
+    #   phrase -> las palabras seguidas y en ese orden
+    #   any    -> cualquiera de las palabras (como prefijo); BM25 puntúa mejor las que coinciden en más
+    #   raw    -> sintaxis FTS5 tal cual (OR, NOT, NEAR, columna:término...)
+    if mode not in MODES:
+        raise ValueError(f"Modo de búsqueda desconocido: {mode}. Opciones: {', '.join(MODES)}")
+    if mode == "raw":
+        return query
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    if mode == "phrase":
+        return '"' + " ".join(words) + '"'
+    if mode == "any":
+        return " OR ".join(f'"{word}"*' for word in words)
+    suffix = "*" if mode == "prefix" else ""
+    return " ".join(f'"{word}"{suffix}' for word in words)
+
+
+def search_quotes(engine, query, mode="words", limit=20, offset=0, table="quotes"):
+    # Citas ordenadas por relevancia BM25 (menor puntuación = más relevante)
+    fts = _fts_table(table)
+    expression = match_expression(query, mode)
+    columns = ["id", "text", "author", "tags", "score"]
+    if expression is None:
+        return pd.DataFrame(columns=columns)
+
+    weights = ", ".join(str(weight) for weight in WEIGHTS)
+    sql = text(f"""
+        SELECT q.id, q.text, q.author, q.tags, bm25({fts}, {weights}) AS score
+        FROM {fts}
+        JOIN {table} AS q ON q.id = {fts}.rowid
+        WHERE {fts} MATCH :expression
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(sql, {"expression": expression, "limit": limit, "offset": offset}).fetchall()
+    return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,11 @@
+import pytest
+
+from fixture_server import FixtureServer, QuotesSite
+
+# Fixtures compartidas por los tests (los helpers que se importan están en helpers.py)
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5)) as srv:
+        yield srv
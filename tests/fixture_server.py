@@ -0,0 +1,166 @@
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class QuotesSite:
+    # Sitio sintético con el mismo HTML que quotes.toscrape.com.
+    # filler_words alarga citas y biografías para acercar el tamaño de las páginas al del sitio real.
+    def __init__(self, pages=3, quotes_per_page=4, authors=5, filler_words=0):
+        self.pages = pages
+        self.quotes_per_page = quotes_per_page
+        self.authors = authors
+        self.filler = "".join(f" word{i}" for i in range(filler_words))
+        self.revisions = {}
+
+    def edit(self, page):
+        # Simula un cambio de contenido en una página de listado
+        self.revisions[page] = self.revisions.get(page, 0) + 1
+
+    def quote(self, page, i):
+        n = (page - 1) * self.quotes_per_page + i
+        author = n % self.authors
+        revision = f" (rev {self.revisions[page]})" if self.revisions.get(page) else ""
+        return {
+            "text": f"“Quote number {n}{revision}{self.filler}.”",
+            "author": f"Author {author}",
+            "slug": f"Author-{author}",
+            "tags": [f"tag{n % 3}", f"tag{n % 7}"],
+        }
+
+    def listing_page(self, page):
+        items = []
+        for i in range(self.quotes_per_page):
+            q = self.quote(page, i)
+            tags = "".join(f'<a class="tag" href="/tag/{t}/page/1/">{t}</a>' for t in q["tags"])
+            items.append(
+                '<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">'
+                f'<span class="text" itemprop="text">{q["text"]}</span>'
+                f'<span>by <small class="author" itemprop="author">{q["author"]}</small>'
+                f'<a href="/author/{q["slug"]}">(about)</a></span>'
+                f'<div class="tags">Tags: {tags}</div>'
+                '</div>'
+            )
+        pager = ""
+        if page < self.pages:
+            pager = f'<nav><ul class="pager"><li class="next"><a href="/page/{page + 1}/">Next</a></li></ul></nav>'
+        return f'<html><body><div class="container">{"".join(items)}{pager}</div></body></html>'
+
+    def author_page(self, slug):
+        name = slug.replace("-", " ")
+        return (
+            '<html><body><div class="author-details">'
+            f'<h3 class="author-title">{name}</h3>'
+            f'<div class="author-description">Biography of {name}{self.filler}.</div>'
+            '</div></body></html>'
+        )
+
+    def render(self, path):
+        if path in ("/", "/page/1/"):
+            return self.listing_page(1)
+        if path.startswith("/page/"):
+            page = int(path.strip("/").split("/")[1])
+            if 1 <= page <= self.pages:
+                return self.listing_page(page)
+        if path.startswith("/author/"):
+            return self.author_page(path.strip("/").split("/")[1])
+        return None
+
+
+class FixtureServer:
+    # delay + un jitter aleatorio entre 0 y `jitter` segundos simulan la latencia del servidor
+    def __init__(self, site=None, etags=True, faults=None, delay=0.0, jitter=0.0):
+        self.site = site or QuotesSite()
+        self.etags = etags
+        # faults: ruta -> lista de códigos de error a devolver antes de responder con normalidad
+        self.faults = {path: list(statuses) for path, statuses in (faults or {}).items()}
+        self.delay = delay
+        self.jitter = jitter
+        self.requests = []
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                    pending_faults = server.faults.get(self.path)
+                    fault = pending_faults.pop(0) if pending_faults else None
+                latency = server.delay + random.uniform(0, server.jitter)
+                if latency:
+                    time.sleep(latency)
+                if fault is not None:
+                    self.send_response(fault)
+                    if fault == 429:
+                        self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.site.render(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                etag = f'"{hashlib.md5(payload).hexdigest()}"'
+                if server.etags and self.headers.get("If-None-Match") == etag:
+                    with server.lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if server.etags:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    # Servidor independiente para pruebas manuales: python tests/fixture_server.py --pages 100
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--filler-words", type=int, default=0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = QuotesSite(args.pages, args.quotes_per_page, args.authors, args.filler_words)
+    with FixtureServer(site, delay=args.delay, jitter=args.jitter) as server:
+        print(f"Sirviendo {args.pages} páginas en {server.url} (Ctrl+C para salir)")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
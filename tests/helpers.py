@@ -0,0 +1,18 @@
+import pandas as pd
+
+# Helpers compartidos por los tests (módulo normal, como fixture_server; las fixtures están en conftest.py)
+
+
+def record(text_, author, tags, **fields):
+    # Cita con el formato que produce el crawler y recibe QuoteScraper.store_records (fields sobrescribe campos)
+    return {"text": text_, "author": author, "tags": tags, "about_author": f"Bio {author}", **fields}
+
+
+def candidates(n=12):
+    # Candidatas del recomendador: la fila i (desde 1) es la cita con id i del prompt y su autor es "Author i".
+    # Textos de longitud variada, como en quotes.toscrape.com: unos pocos largos fijan el ancho de to_string
+    quotes = []
+    for i in range(1, n + 1):
+        words = " ".join(["wisdom", "courage", "heart", "life"] * (2 + (i % 5) * (6 if i % 9 == 0 else 1)))
+        quotes.append({"text": f"Quote {i}: {words}.", "tags": f"life, tag{i % 7}", "author": f"Author {i}"})
+    return pd.DataFrame(quotes)
@@ -0,0 +1,20 @@
+import pandas as pd
+from async_crawler import AsyncQuoteCrawler
+from oop_scraper import QuoteScraper
+
+def test_async_crawl_matches_sync(server, tmp_path):
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"))
+    expected = scraper.scrape_quotes()
+
+    df = scraper.scrape_quotes_async(max_concurrency=4, max_per_host=2)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+def test_async_crawl_fetches_every_page(server):
+    df = AsyncQuoteCrawler(server.url).run()
+
+    assert len(df) == 12
+    assert list(df.columns) == ["text", "author", "tags", "about_author"]
+    assert server.requests.count("/") == 1
+    assert "/page/3/" in server.requests
+    assert df.iloc[0]["about_author"] == "Biography of Author 0."
@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import Mock
+from async_crawler import AsyncQuoteCrawler
+from author_cache import AuthorCache
+from fixture_server import FixtureServer, QuotesSite
+from oop_scraper import QuoteScraper
+
+def test_get_or_fetch_counts_hits_and_misses():
+    cache = AuthorCache()
+    fetch = Mock(return_value="Bio")
+
+    assert cache.get_or_fetch("http://x/author/A", fetch) == "Bio"
+    assert cache.get_or_fetch("http://x/author/A", fetch) == "Bio"
+
+    fetch.assert_called_once_with("http://x/author/A")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_concurrent_requests_are_coalesced():
+    cache = AuthorCache()
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return "Bio"
+
+    async def crawl():
+        return await asyncio.gather(*[cache.get_or_fetch_async("http://x/author/A", fetch) for _ in range(10)])
+
+    assert asyncio.run(crawl()) == ["Bio"] * 10
+    assert calls == ["http://x/author/A"]
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 9
+
+def test_sqlite_cache_persists_across_crawls(tmp_path):
+    db_path = str(tmp_path / "authors.db")
+    cache = AuthorCache(db_path)
+    cache.set("http://x/author/A", "Bio")
+    cache.close()
+
+    cache = AuthorCache(db_path)
+    fetch = Mock()
+    assert cache.get_or_fetch("http://x/author/A", fetch) == "Bio"
+    fetch.assert_not_called()
+
+def test_closed_cache_reopens_on_use(tmp_path):
+    with AuthorCache(str(tmp_path / "authors.db")) as cache:
+        cache.set("http://x/author/A", "Bio")
+    assert cache._conn is None
+
+    cache._memory.clear()
+    assert cache.get("http://x/author/A") == "Bio"
+    cache.close()
+
+def test_scraper_runs_close_the_author_cache(tmp_path):
+    with FixtureServer(QuotesSite(pages=2, quotes_per_page=2, authors=2)) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               author_cache_path=str(tmp_path / "authors.db"))
+        for run in (scraper.run, scraper.run_pipeline, lambda: scraper.crawl_sites([server.url])):
+            run()
+            assert scraper.author_cache._conn is None
+
+def test_crawl_fetches_each_author_once():
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5)) as server:
+        cache = AuthorCache()
+        df = AsyncQuoteCrawler(server.url, author_cache=cache).run()
+
+        author_requests = [path for path in server.requests if path.startswith("/author/")]
+
+    assert len(df) == 12
+    assert len(author_requests) == 5
+    assert cache.stats()["hits"] + cache.stats()["coalesced"] == 7
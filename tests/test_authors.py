@@ -0,0 +1,126 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, text
+
+from helpers import record
+from oop_scraper import QuoteScraper, author_slug
+
+
+def flat(scraper):
+    with scraper.engine.connect() as conn:
+        result = conn.execute(text("SELECT text, author, about_author FROM quotes_flat ORDER BY id"))
+        return [tuple(row) for row in result]
+
+
+def test_author_slug():
+    assert author_slug("J.K. Rowling") == "j-k-rowling"
+    assert author_slug("  Albert   Einstein ") == "albert-einstein"
+
+
+def test_biography_stored_once_per_author(tmp_path):
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"))
+    scraper.store_records([record(f"Quote {i}", "Albert Einstein", "life", about_author="Long biography") for i in range(5)])
+
+    with scraper.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM authors")).scalar() == 1
+        assert conn.execute(text("SELECT count(DISTINCT author_id) FROM quotes")).scalar() == 1
+    assert "about_author" not in [column["name"] for column in inspect(scraper.engine).get_columns("quotes")]
+    assert flat(scraper)[0] == ("Quote 0", "Albert Einstein", "Long biography")
+
+
+def test_biography_update_is_shared_and_not_erased(tmp_path):
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"))
+    scraper.store_records([record("Quote 1", "Jane Austen", "life", about_author="Old bio"),
+                           record("Quote 2", "Jane Austen", "life", about_author="Old bio")])
+
+    counts = scraper.store_records([record("Quote 1", "Jane Austen", "life", about_author="New bio")])
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 1}
+    assert [row[2] for row in flat(scraper)] == ["New bio", "New bio"]
+
+    scraper.store_records([record("Quote 3", "Jane Austen", "life", about_author=None)])
+    assert [row[2] for row in flat(scraper)] == ["New bio", "New bio", "New bio"]
+
+
+def test_legacy_database_is_migrated(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                 "tags VARCHAR(200), about_author TEXT)")
+    conn.executemany("INSERT INTO quotes (text, author, tags, about_author) VALUES (?, ?, 'life', ?)",
+                     [(f"Quote {i}", f"Author {i % 2}", f"Biography {i % 2} " * 200) for i in range(50)])
+    conn.commit()
+    conn.close()
+    size_before = db_path.stat().st_size
+
+    scraper = QuoteScraper("http://localhost/", db_name=str(db_path))
+    rows = flat(scraper)
+    assert len(rows) == 50
+    assert rows[3] == ("Quote 3", "Author 1", "Biography 1 " * 200)
+    with scraper.engine.connect() as conn:
+        df = pd.DataFrame(conn.execute(text("SELECT id, text, author, tags, about_author FROM quotes_flat")).fetchall())
+        assert conn.execute(text("SELECT count(*) FROM authors")).scalar() == 2
+    assert len(df.columns) == 5
+    scraper.engine.dispose()
+    assert db_path.stat().st_size < size_before
+
+
+def legacy_database(db_path, rows=()):
+    # Esquema de las versiones anteriores (la GUI creaba quotes_internet.db con quotes vacía)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                 "tags VARCHAR(200), about_author TEXT)")
+    conn.executemany("INSERT INTO quotes (text, author, tags, about_author) VALUES (?, ?, 'life', ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_empty_legacy_table_is_migrated(tmp_path):
+    db_path = tmp_path / "quotes_internet.db"
+    legacy_database(db_path)
+
+    scraper = QuoteScraper("http://localhost/", db_name=str(db_path))
+    assert flat(scraper) == []
+    columns = [column["name"] for column in inspect(scraper.engine).get_columns("quotes")]
+    assert "author_id" in columns and "about_author" not in columns
+    scraper.store_records([record("Quote 1", "Jane Austen", "life", about_author="Bio")])
+    assert flat(scraper) == [("Quote 1", "Jane Austen", "Bio")]
+
+
+def test_migration_links_name_variants_to_one_author(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    legacy_database(db_path, [("Quote 1", "J.K. Rowling", "Bio"), ("Quote 2", "J. K. Rowling", None),
+                              ("Quote 3", "Jane Austen", "Other bio")])
+
+    scraper = QuoteScraper("http://localhost/", db_name=str(db_path))
+    assert [row[2] for row in flat(scraper)] == ["Bio", "Bio", "Other bio"]
+    with scraper.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(DISTINCT author_id) FROM quotes")).scalar() == 2
+        assert conn.execute(text("SELECT count(*) FROM quotes WHERE author_id IS NULL")).scalar() == 0
+
+
+def test_failed_migration_leaves_schema_untouched(tmp_path, monkeypatch):
+    import oop_scraper
+    from db import create_sqlite_engine
+
+    db_path = tmp_path / "legacy.db"
+    legacy_database(db_path, [("Quote 1", "Jane Austen", "Bio")])
+    engine = create_sqlite_engine(str(db_path))
+    oop_scraper.Base.metadata.create_all(engine)
+    oop_scraper.migrate_quotes_table(engine)
+
+    def fail(conn, authors):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(oop_scraper, "upsert_authors", fail)
+    with pytest.raises(RuntimeError):
+        oop_scraper.migrate_authors_table(engine)
+    # El ALTER TABLE se deshace con el resto: la siguiente apertura repite la migración completa
+    columns = [column["name"] for column in inspect(engine).get_columns("quotes")]
+    assert "author_id" not in columns and "about_author" in columns
+    monkeypatch.undo()
+    oop_scraper.migrate_authors_table(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT about_author FROM quotes_flat")).scalar() == "Bio"
+    engine.dispose()
@@ -0,0 +1,108 @@
+import pytest
+from checkpoint import CrawlCheckpoint, CrawlState
+from exporters import ParquetExporter
+from oop_scraper import QuoteScraper, Quote
+from rate_limiter import RetryPolicy
+from fixture_server import FixtureServer, QuotesSite
+
+def test_checkpoint_roundtrip(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / "crawl.db"), "http://x/")
+    state = CrawlState(["http://x/"])
+    state.start_page("http://x/")
+    state.add_author("http://x/author/A", "Bio A")
+    state.finish_page("http://x/", "http://x/page/2/")
+    state.start_page("http://x/page/2/")
+    checkpoint.save(state)
+
+    loaded = checkpoint.load()
+
+    assert loaded.pending() == ["http://x/page/2/"]
+    assert loaded.visited == {"http://x/"}
+    assert loaded.authors == {"http://x/author/A": "Bio A"}
+
+    checkpoint.clear()
+    assert checkpoint.load() is None
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_resume_after_crash_skips_completed_pages(tmp_path, concurrent):
+    site = QuotesSite(pages=4, quotes_per_page=4, authors=5)
+    with FixtureServer(site, faults={"/page/3/": [503] * 3}) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               retry_policy=RetryPolicy(max_retries=1, backoff_base=0.01))
+        with pytest.raises(Exception):
+            scraper.run_pipeline(concurrent=concurrent, batch_size=4)
+
+        requests_before = len(server.requests)
+        counts = scraper.run_pipeline(concurrent=concurrent, batch_size=4, resume=True)
+
+        resumed = server.requests[requests_before:]
+
+    assert "/" not in resumed
+    assert "/page/2/" not in resumed
+    assert resumed[0] == "/page/3/"
+    # Los autores completados antes del fallo no se vuelven a descargar
+    assert not [path for path in resumed if path.startswith("/author/")]
+    assert counts["inserted"] == 8
+    session = scraper.Session()
+    assert session.query(Quote).count() == 16
+    session.close()
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_resume_with_http_cache_finishes_half_stored_page(tmp_path, monkeypatch, concurrent):
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5)) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               http_cache_path=str(tmp_path / "http.db"))
+        store_records = scraper.store_records
+        calls = []
+
+        def failing_store(records):
+            # El cuarto lote es la segunda mitad de la página 2: la primera ya está guardada
+            calls.append(len(records))
+            if len(calls) == 4:
+                raise RuntimeError("disco lleno")
+            return store_records(records)
+
+        monkeypatch.setattr(scraper, "store_records", failing_store)
+        with pytest.raises(RuntimeError):
+            scraper.run_pipeline(concurrent=concurrent, batch_size=2)
+        monkeypatch.undo()
+
+        requests_before = len(server.requests)
+        scraper.run_pipeline(concurrent=concurrent, batch_size=2, resume=True)
+        resumed = server.requests[requests_before:]
+
+    assert resumed[0] == "/page/2/"
+    session = scraper.Session()
+    assert session.query(Quote).count() == 12
+    session.close()
+
+def test_resume_continues_exports(tmp_path):
+    import pandas as pd
+
+    # Falla la biografía de la segunda cita de la página 3: la primera ya se exportó y al reanudar se repite
+    with FixtureServer(QuotesSite(pages=4, quotes_per_page=4, authors=16),
+                       faults={"/author/Author-9": [503] * 3}) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"), exports=["csv", "jsonl", "parquet"],
+                               retry_policy=RetryPolicy(max_retries=1, backoff_base=0.01))
+        scraper.script_dir = str(tmp_path)
+        with pytest.raises(Exception):
+            scraper.run_pipeline(batch_size=3)
+        scraper.run_pipeline(batch_size=3, resume=True)
+
+    csv_rows = pd.read_csv(tmp_path / "quotes_db.csv")
+    jsonl_rows = pd.read_json(tmp_path / "quotes_db.jsonl", lines=True)
+    parquet_rows = pd.read_parquet(ParquetExporter.parts(str(tmp_path / "quotes_db.parquet")))
+    assert len(csv_rows) == len(jsonl_rows) == len(parquet_rows) == 16
+    assert not csv_rows.duplicated(["text", "author"]).any()
+    assert parquet_rows.equals(csv_rows)
+    # Terminado el crawl, el checkpoint ya no guarda los hashes exportados
+    with scraper.engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM crawl_exported").scalar() == 0
+
+def test_finished_crawl_starts_over(tmp_path):
+    with FixtureServer(QuotesSite(pages=2, quotes_per_page=2, authors=2)) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"))
+        scraper.run_pipeline(batch_size=2)
+        counts = scraper.run_pipeline(batch_size=2, resume=True)
+
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 4}
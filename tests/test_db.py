@@ -0,0 +1,55 @@
+import os
+from unittest.mock import Mock
+
+from sqlalchemy import text
+
+from db import get_database
+from oop_scraper import QuoteScraper
+
+
+def test_get_database_is_shared_and_set_up_once(tmp_path):
+    # El fichero se crea al abrir la primera conexión
+    setup = Mock(side_effect=lambda engine: engine.connect().close())
+    db_path = str(tmp_path / "shared.db")
+
+    first = get_database(db_path, setup=setup)
+    second = get_database(os.path.relpath(db_path), setup=setup)
+
+    assert first is second
+    setup.assert_called_once_with(first.engine)
+    # Otra configuración de PRAGMAs es otro engine
+    assert get_database(db_path, pragmas={"foreign_keys": "ON"}, setup=setup) is not first
+
+
+def test_setup_runs_when_first_requested_on_a_cached_database(tmp_path):
+    db_path = str(tmp_path / "quotes.db")
+    calls = []
+    bare = get_database(db_path)
+    bare.engine.connect().close()
+    database = get_database(db_path, setup=calls.append)
+    get_database(db_path, setup=calls.append)
+
+    assert database is bare
+    assert calls == [bare.engine]
+
+
+def test_database_recreated_when_file_is_deleted(tmp_path):
+    db_path = str(tmp_path / "deleted.db")
+    first = get_database(db_path)
+    with first.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    first.dispose()
+    os.remove(db_path)
+
+    assert get_database(db_path) is not first
+
+
+def test_scrapers_reuse_engine_and_schema(tmp_path):
+    db_path = str(tmp_path / "quotes.db")
+    scraper = QuoteScraper("http://localhost/", db_name=db_path)
+    other = QuoteScraper("http://localhost/other/", db_name=db_path)
+
+    assert other.engine is scraper.engine
+    with scraper.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("SELECT count(*) FROM sqlite_master WHERE name = 'quotes_flat'")).scalar() == 1
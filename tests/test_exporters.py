@@ -0,0 +1,113 @@
+import json
+
+import pandas as pd
+import pytest
+
+from exporters import COLUMNS, EXPORTERS, ExcelExporter, Exporter, ParquetExporter, get_exporter
+
+RECORDS = [
+    {"text": f"Quote {i}", "author": f"Author {i % 3}", "tags": "tag1, tag2", "about_author": "Bio"}
+    for i in range(10)
+]
+
+
+def write_in_batches(fmt, path, size=4):
+    with get_exporter(fmt, str(path)) as exporter:
+        for start in range(0, len(RECORDS), size):
+            exporter.write(RECORDS[start:start + size])
+    return exporter
+
+
+def test_csv_appends_batches(tmp_path):
+    exporter = write_in_batches("csv", tmp_path / "quotes.csv")
+
+    assert exporter.rows == len(RECORDS)
+    assert pd.read_csv(tmp_path / "quotes.csv").to_dict("records") == RECORDS
+
+
+def test_jsonl_one_object_per_line(tmp_path):
+    write_in_batches("jsonl", tmp_path / "quotes.jsonl")
+
+    lines = (tmp_path / "quotes.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_parquet_writes_a_row_group_per_batch(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    write_in_batches("parquet", tmp_path / "quotes.parquet")
+
+    parquet_file = pq.ParquetFile(tmp_path / "quotes.parquet")
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.read().to_pylist() == RECORDS
+
+
+def test_excel_roundtrip_and_row_limit(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    write_in_batches("excel", tmp_path / "quotes.xlsx")
+    assert pd.read_excel(tmp_path / "quotes.xlsx").columns.tolist() == COLUMNS
+
+    monkeypatch.setattr(ExcelExporter, "max_rows", 5)
+    with pytest.raises(ValueError):
+        write_in_batches("excel", tmp_path / "limit.xlsx")
+
+
+READERS = {
+    "csv": pd.read_csv,
+    "jsonl": lambda path: pd.read_json(path, lines=True),
+    "parquet": lambda path: pd.read_parquet(ParquetExporter.parts(str(path))),
+    "excel": pd.read_excel,
+}
+OPTIONAL = {"parquet": "pyarrow", "excel": "openpyxl"}
+
+
+@pytest.mark.parametrize("fmt", list(READERS))
+def test_append_continues_file(tmp_path, fmt):
+    if fmt in OPTIONAL:
+        pytest.importorskip(OPTIONAL[fmt])
+    path = tmp_path / f"quotes{EXPORTERS[fmt].extension}"
+    with get_exporter(fmt, str(path)) as exporter:
+        exporter.write(RECORDS[:6])
+    with get_exporter(fmt, str(path), append=True) as exporter:
+        exporter.write(RECORDS[6:8])
+        exporter.write(RECORDS[8:])
+
+    assert exporter.rows == 4
+    assert READERS[fmt](path).to_dict("records") == RECORDS
+
+
+def test_parquet_append_writes_parts_without_rewriting(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "quotes.parquet"
+    with get_exporter("parquet", str(path)) as exporter:
+        exporter.write(RECORDS[:4])
+    before = path.read_bytes()
+    for start in (4, 8):
+        with get_exporter("parquet", str(path), append=True) as exporter:
+            exporter.write(RECORDS[start:start + 4])
+
+    assert path.read_bytes() == before
+    assert ParquetExporter.parts(str(path)) == [str(path), str(tmp_path / "quotes.part1.parquet"),
+                                                str(tmp_path / "quotes.part2.parquet")]
+    assert pd.read_parquet(ParquetExporter.parts(str(path))).to_dict("records") == RECORDS
+
+    # Un export nuevo sustituye al anterior con todas sus partes
+    with get_exporter("parquet", str(path)) as exporter:
+        exporter.write(RECORDS[:2])
+    assert ParquetExporter.parts(str(path)) == [str(path)]
+
+
+def test_exporter_requires_write():
+    with pytest.raises(TypeError):
+        Exporter("quotes.txt")
+
+
+def test_append_to_missing_file_writes_header(tmp_path):
+    with get_exporter("csv", str(tmp_path / "quotes.csv"), append=True) as exporter:
+        exporter.write(RECORDS)
+
+    assert pd.read_csv(tmp_path / "quotes.csv").to_dict("records") == RECORDS
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        get_exporter("xml", str(tmp_path / "quotes.xml"))
@@ -0,0 +1,44 @@
+import os
+import pytest
+from extractors import EXTRACTORS, SoupExtractor, get_extractor
+from fixture_server import QuotesSite
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BASE_URL = "http://quotes.toscrape.com/page/1/"
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+@pytest.mark.parametrize("name", sorted(EXTRACTORS))
+@pytest.mark.parametrize("page", ["quotes_page.html", "quotes_last_page.html"])
+def test_quote_page_parity(name, page):
+    html = read_fixture(page)
+
+    assert get_extractor(name).parse_quote_page(html, BASE_URL) == SoupExtractor().parse_quote_page(html, BASE_URL)
+
+@pytest.mark.parametrize("name", sorted(EXTRACTORS))
+def test_author_page_parity(name):
+    html = read_fixture("author_page.html")
+
+    assert get_extractor(name).parse_author_page(html) == SoupExtractor().parse_author_page(html)
+
+@pytest.mark.parametrize("name", sorted(EXTRACTORS))
+def test_synthetic_site_parity(name):
+    site = QuotesSite(pages=2, quotes_per_page=10, authors=3)
+    html = site.listing_page(1)
+
+    assert get_extractor(name).parse_quote_page(html, BASE_URL) == SoupExtractor().parse_quote_page(html, BASE_URL)
+
+def test_reference_extractor_fields():
+    quotes, next_url = SoupExtractor().parse_quote_page(read_fixture("quotes_page.html"), BASE_URL)
+
+    assert len(quotes) == 10
+    assert quotes[0]["author"] == "Albert Einstein"
+    assert quotes[0]["tags"] == "change, deep-thoughts, thinking, world"
+    assert quotes[0]["author_url"] == "http://quotes.toscrape.com/author/Albert-Einstein"
+    assert next_url == "http://quotes.toscrape.com/page/2/"
+
+def test_get_extractor_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_extractor("regex")
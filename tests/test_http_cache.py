@@ -0,0 +1,110 @@
+import pytest
+from async_crawler import AsyncQuoteCrawler
+from http_cache import HttpCache
+from oop_scraper import QuoteScraper, Quote
+from fixture_server import FixtureServer, QuotesSite
+
+def test_resolve_detects_unchanged_body(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.db"))
+
+    assert cache.resolve("http://x/", 200, {}, "<html>1</html>") == ("<html>1</html>", True)
+    assert cache.resolve("http://x/", 200, {}, "<html>1</html>") == ("<html>1</html>", False)
+    assert cache.resolve("http://x/", 200, {}, "<html>2</html>") == ("<html>2</html>", True)
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+def test_conditional_headers_and_304(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.db"))
+    cache.resolve("http://x/", 200, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, "body")
+
+    assert cache.conditional_headers("http://x/") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.resolve("http://x/", 304, {}, "") == ("body", False)
+
+def test_deferred_validators_wait_for_commit(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.db"))
+    cache.resolve("http://x/", 200, {"ETag": '"abc"'}, "body", defer=True)
+    cache.set_next_url("http://x/", "http://x/page/2/")
+
+    assert cache.get("http://x/") is None
+    assert cache.conditional_headers("http://x/") == {}
+
+    cache.commit(["http://x/"])
+    assert cache.conditional_headers("http://x/") == {"If-None-Match": '"abc"'}
+    assert cache.get_next_url("http://x/") == "http://x/page/2/"
+
+    cache.resolve("http://x/", 200, {"ETag": '"def"'}, "body 2", defer=True)
+    cache.discard()
+    cache.commit()
+    assert cache.get("http://x/")["etag"] == '"abc"'
+
+def test_recrawl_only_returns_changed_pages(server, tmp_path):
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                           http_cache_path=str(tmp_path / "http.db"))
+
+    assert len(scraper.run()) == 12
+    # Cada ejecución cierra la conexión de la caché y la siguiente la vuelve a abrir
+    assert scraper.http_cache._conn is None
+    assert scraper.run().empty
+    assert server.not_modified >= 3
+
+    server.site.edit(2)
+    df = scraper.run()
+
+    assert len(df) == 4
+    assert df["text"].str.contains("rev 1").all()
+
+def test_async_recrawl_uses_cached_next_links(server, tmp_path):
+    cache = HttpCache(str(tmp_path / "http.db"))
+    assert len(AsyncQuoteCrawler(server.url, http_cache=cache).run()) == 12
+    cache.commit()
+
+    server.site.edit(3)
+    df = AsyncQuoteCrawler(server.url, http_cache=cache).run()
+
+    assert len(df) == 4
+    assert server.requests.count("/page/3/") == 2
+
+def test_recrawl_without_validators_uses_body_hash(tmp_path):
+    with FixtureServer(QuotesSite(pages=2, quotes_per_page=2, authors=2), etags=False) as server:
+        cache = HttpCache(str(tmp_path / "http.db"))
+        AsyncQuoteCrawler(server.url, http_cache=cache).run()
+        cache.commit()
+        df = AsyncQuoteCrawler(server.url, http_cache=cache).run()
+
+    assert df.empty
+    assert server.not_modified == 0
+
+def test_uncommitted_crawl_is_not_cached(server, tmp_path):
+    cache = HttpCache(str(tmp_path / "http.db"))
+    AsyncQuoteCrawler(server.url, http_cache=cache).run()
+    cache.discard()
+
+    assert len(AsyncQuoteCrawler(server.url, http_cache=cache).run()) == 12
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_recrawl_after_failed_store_keeps_every_row(server, tmp_path, monkeypatch, concurrent):
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                           http_cache_path=str(tmp_path / "http.db"))
+    store_records = scraper.store_records
+    calls = []
+
+    def failing_store(records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("disco lleno")
+        return store_records(records)
+
+    monkeypatch.setattr(scraper, "store_records", failing_store)
+    with pytest.raises(RuntimeError):
+        scraper.run_pipeline(concurrent=concurrent, batch_size=4)
+    monkeypatch.undo()
+
+    # Sin resume: la página 1 llega sin cambios, las 2 y 3 se vuelven a procesar y guardar
+    counts = scraper.run_pipeline(concurrent=concurrent, batch_size=4)
+
+    assert counts["inserted"] == 8
+    session = scraper.Session()
+    assert session.query(Quote).count() == 12
+    session.close()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_import import HEAVY_MODULES, import_profile
+
+# Presupuesto holgado para máquinas lentas; se puede ajustar con GUI_IMPORT_BUDGET (segundos)
+BUDGET = float(os.environ.get("GUI_IMPORT_BUDGET", "3.0"))
+
+
+def test_gui_import_is_lazy_and_within_budget():
+    profile = import_profile("gui_scraper")
+
+    assert [name for name in HEAVY_MODULES if name in profile.modules] == []
+    assert profile.total < BUDGET
@@ -0,0 +1,75 @@
+import json
+import logging
+
+import pytest
+
+from fixture_server import FixtureServer, QuotesSite
+from metrics import JsonSummarySink, MetricsRegistry, PrometheusSink
+from oop_scraper import QuoteScraper, get_logger
+
+
+def test_histogram_and_prometheus_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.record_request("example.com", 200, 0.05, 1024)
+    registry.record_request("example.com", 200, 0.5)
+    registry.record_request("example.com", None, 3.0)
+    registry.set("scraper_cache_hits", 7, cache="author")
+
+    text = registry.prometheus()
+    assert 'scraper_requests_total{host="example.com",status="200"} 2' in text
+    assert 'scraper_requests_total{host="example.com",status="error"} 1' in text
+    assert 'scraper_bytes_downloaded_total{host="example.com"} 1024' in text
+    assert 'scraper_request_seconds_bucket{host="example.com",status="200",le="0.1"} 1' in text
+    assert 'scraper_request_seconds_bucket{host="example.com",status="200",le="1.0"} 2' in text
+    assert 'scraper_request_seconds_bucket{host="example.com",status="error",le="+Inf"} 1' in text
+    assert 'scraper_cache_hits{cache="author"} 7' in text
+
+    summary = registry.summary()
+    assert summary["stage_seconds"]["network"] == pytest.approx(3.55)
+    assert summary["bound"] == "network"
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_run_pipeline_records_metrics(tmp_path, concurrent):
+    site = QuotesSite(pages=3, quotes_per_page=4, authors=2)
+    sinks = [PrometheusSink(str(tmp_path / "metrics.prom")), JsonSummarySink(str(tmp_path / "summary.json"))]
+    with FixtureServer(site) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"), metrics_sinks=sinks)
+        scraper.run_pipeline(concurrent=concurrent, batch_size=5)
+
+    metrics = scraper.metrics
+    # 3 listados + 2 autores, todos con 200
+    assert metrics.counter_total("scraper_requests_total") == 5
+    assert metrics.counter_total("scraper_bytes_downloaded_total") > 0
+    assert sum(h.count for h in metrics.histograms["scraper_parse_seconds"].values()) == 5
+    assert sum(h.count for h in metrics.histograms["scraper_db_batch_seconds"].values()) == 3
+    assert metrics.counters["scraper_db_rows_total"][(("result", "inserted"),)] == 12
+
+    summary = json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))
+    assert set(summary["stage_seconds"]) == {"network", "parse", "storage"}
+    # 12 citas y 2 autores: el resto se sirve desde la caché (en async, parte como peticiones agrupadas)
+    assert [gauge["cache"] for gauge in summary["gauges"]["scraper_cache_misses"]] == ["author"]
+    assert summary["gauges"]["scraper_cache_misses"][0]["value"] == 2
+    assert "# TYPE scraper_request_seconds histogram" in (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+
+
+def test_each_run_reports_its_own_metrics(tmp_path):
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=2)) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"))
+        scraper.run_pipeline(batch_size=5)
+        first_started = scraper.metrics.started
+        scraper.run_pipeline(batch_size=5)
+
+    metrics = scraper.metrics
+    assert metrics.counter_total("scraper_requests_total") == 5
+    rows = metrics.counters["scraper_db_rows_total"]
+    assert rows[(("result", "inserted"),)] == 0 and rows[(("result", "unchanged"),)] == 12
+    assert metrics.started > first_started
+
+
+def test_get_logger_does_not_touch_root_logger():
+    root_handlers = list(logging.getLogger().handlers)
+    logger = get_logger()
+    assert logger is not logging.getLogger()
+    assert logger.propagate is False
+    assert logging.getLogger().handlers == root_handlers
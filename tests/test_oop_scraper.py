@@ -7,13 +7,15 @@ from unittest.mock import Mock, patch
 import pandas as pd
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from oop_scraper import QuoteScraper, Quote, Base, get_logger, hash_string
+from oop_scraper import QuoteScraper, Quote, Base, get_logger, hash_string, quote_hash, migrate_quotes_table
+from sqlalchemy import text
 import logging
+import hashlib
 
 @pytest.fixture
-def mock_scraper():
+def mock_scraper(tmp_path):
     with patch('oop_scraper.requests.get'), patch('oop_scraper.BeautifulSoup'):
-        scraper = QuoteScraper("https://quotes.toscrape.com/", db_name='test.db')
+        scraper = QuoteScraper("https://quotes.toscrape.com/", db_name=str(tmp_path / 'test.db'))
         yield scraper
 
 @pytest.fixture
@@ -27,6 +29,16 @@ def test_setup_database(mock_scraper):
     assert mock_scraper.engine is not None
     assert mock_scraper.Session is not None
 
+def test_setup_database_applies_pragmas(tmp_path):
+    with patch('oop_scraper.requests.get'):
+        scraper = QuoteScraper("https://quotes.toscrape.com/", db_name=str(tmp_path / 'pragmas.db'),
+                               pragmas={"journal_mode": "WAL", "synchronous": "OFF"})
+
+    assert scraper.engine.echo is False
+    with scraper.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 0
+
 def test_scrape_quotes(mock_scraper):
     mock_scraper.scrape_author = Mock(return_value="Mock author description")
     with patch('oop_scraper.BeautifulSoup') as mock_bs:
@@ -68,6 +80,63 @@ def test_store_data(mock_scraper, mock_session):
     assert stored_quote.text == 'Quote 1'
     assert stored_quote.author == 'Author 1'
 
+def test_store_data_upserts(mock_scraper, mock_session):
+    df = pd.DataFrame({
+        'text': ['Quote 1', 'Quote 2'],
+        'author': ['Author 1', 'Author 2'],
+        'tags': ['tag1', 'tag2'],
+        'about_author': ['About 1', 'About 2']
+    })
+
+    with patch.object(mock_scraper, 'Session', return_value=mock_session):
+        first = mock_scraper.store_data(df)
+        second = mock_scraper.store_data(df)
+        df.loc[1, 'tags'] = 'tag2, tag3'
+        third = mock_scraper.store_data(df)
+
+    assert first == {"inserted": 2, "updated": 0, "unchanged": 0}
+    assert second == {"inserted": 0, "updated": 0, "unchanged": 2}
+    assert third == {"inserted": 0, "updated": 1, "unchanged": 1}
+    assert mock_session.query(Quote).count() == 2
+    assert mock_session.query(Quote).filter_by(author='Author 2').one().tags == 'tag2, tag3'
+
+def test_quote_hash_normalizes_whitespace_and_case():
+    assert quote_hash("  A  quote ", "Author") == quote_hash("a quote", "AUTHOR")
+    assert quote_hash("a quote", "Author") != quote_hash("a quote", "Other")
+
+def test_migrate_quotes_table_deduplicates_legacy_rows():
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                          "tags VARCHAR(200), about_author TEXT)"))
+        for _ in range(3):
+            conn.execute(text("INSERT INTO quotes (text, author) VALUES ('Quote 1', 'Author 1')"))
+
+    migrate_quotes_table(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, content_hash FROM quotes")).fetchall()
+    assert rows == [(1, quote_hash('Quote 1', 'Author 1'))]
+
+def test_migrate_quotes_table_converts_hex_hashes():
+    # content_hash de versiones anteriores: SHA-256 completo en hex
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                          "tags VARCHAR(200), content_hash VARCHAR(64))"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_quotes_content_hash ON quotes (content_hash)"))
+        for i in (1, 2):
+            hex_hash = hashlib.sha256(f"quote {i}\x1fauthor {i}".encode()).hexdigest()
+            conn.execute(text("INSERT INTO quotes (text, author, content_hash) VALUES (:text, :author, :hash)"),
+                         {"text": f"Quote {i}", "author": f"Author {i}", "hash": hex_hash})
+
+    migrate_quotes_table(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT content_hash FROM quotes ORDER BY id")).scalars().all()
+    assert rows == [quote_hash('Quote 1', 'Author 1'), quote_hash('Quote 2', 'Author 2')]
+    assert len(rows[0]) == 16
+
 @patch('oop_scraper.pd.DataFrame.to_excel')
 def test_run(mock_to_excel, mock_scraper):
     mock_scraper.scrape_quotes = Mock(return_value=pd.DataFrame({
@@ -84,7 +153,21 @@ def test_run(mock_to_excel, mock_scraper):
     assert len(result_df) == 1
     mock_scraper.scrape_quotes.assert_called_once()
     mock_scraper.store_data.assert_called_once()
-    mock_to_excel.assert_called_once()
+    # Excel ya no se genera por defecto
+    mock_to_excel.assert_not_called()
+
+def test_run_pipeline_exports_batches(tmp_path):
+    from fixture_server import FixtureServer
+
+    with FixtureServer() as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / 'quotes.db'), exports=["csv", "jsonl"])
+        scraper.script_dir = str(tmp_path)
+        counts = scraper.run_pipeline(batch_size=3)
+
+    csv_rows = pd.read_csv(tmp_path / 'quotes_db.csv')
+    jsonl_rows = pd.read_json(tmp_path / 'quotes_db.jsonl', lines=True)
+    assert len(csv_rows) == len(jsonl_rows) == counts["inserted"]
+    assert not (tmp_path / 'quotes_db.xlsx').exists()
 
 def test_get_logger():
     logger = get_logger()
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from async_crawler import AsyncQuoteCrawler
+from extractors import SoupExtractor
+from parse_pool import ParsePool, parse_listing_page, parse_author_page
+from fixture_server import FixtureServer, QuotesSite
+from oop_scraper import QuoteScraper
+from scheduler import SiteConfig
+
+def test_worker_functions_return_plain_dicts():
+    site = QuotesSite(pages=2, quotes_per_page=3, authors=2)
+
+    listing = parse_listing_page("http://x/", site.listing_page(1).encode("utf-8"))
+    author = parse_author_page("http://x/author/Author-0", site.author_page("Author-0").encode("utf-8"))
+
+    assert listing["next_url"] == "http://x/page/2/"
+    assert listing["quotes"] == SoupExtractor().parse_quote_page(site.listing_page(1), "http://x/")[0]
+    assert author == {"url": "http://x/author/Author-0", "about_author": "Biography of Author 0."}
+
+def test_pool_parses_concurrent_listings():
+    site = QuotesSite(pages=6, quotes_per_page=2, authors=3)
+    pages = [(f"http://x/page/{n}/", site.listing_page(n).encode("utf-8")) for n in range(1, 7)]
+
+    async def parse_all(pool):
+        return await asyncio.gather(*(pool.parse_listing_async(url, body) for url, body in pages))
+
+    with ParsePool(workers=2, extractor="lxml") as pool:
+        results = asyncio.run(parse_all(pool))
+
+    assert [result["url"] for result in results] == [url for url, _ in pages]
+    assert results[-1]["next_url"] is None
+    assert results[0]["quotes"][0]["author"] == "Author 0"
+
+def test_crawl_with_parse_workers_matches_inline_parsing():
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5)) as server:
+        expected = AsyncQuoteCrawler(server.url).run()
+        df = AsyncQuoteCrawler(server.url, parse_workers=2).run()
+
+    assert df.equals(expected)
+
+def stored_quotes(scraper):
+    with scraper.engine.connect() as conn:
+        return conn.execute(text("SELECT text, author, tags, about_author FROM quotes_flat ORDER BY id")).fetchall()
+
+def fail_inline(scraper, monkeypatch):
+    # Con parse_workers el proceso principal no parsea: los workers construyen su propio extractor
+    def fail(*args):
+        raise AssertionError("parseo fuera del pool")
+    monkeypatch.setattr(scraper.extractor, "parse_quote_page", fail)
+    monkeypatch.setattr(scraper.extractor, "parse_author_page", fail)
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_scraper_parse_workers_in_pipeline_and_run(tmp_path, monkeypatch, server, concurrent):
+    inline = QuoteScraper(server.url, db_name=str(tmp_path / "inline.db"))
+    inline.run_pipeline(concurrent=concurrent)
+
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "pool.db"), parse_workers=2)
+    fail_inline(scraper, monkeypatch)
+    assert scraper.run_pipeline(concurrent=concurrent)["inserted"] == 12
+    assert stored_quotes(scraper) == stored_quotes(inline)
+
+    df = QuoteScraper(server.url, db_name=str(tmp_path / "run.db"), parse_workers=2).run(concurrent=concurrent)
+    assert len(df) == 12
+
+def test_crawl_sites_shares_one_parse_pool(tmp_path, monkeypatch, server):
+    pools = []
+
+    class CountingPool(ParsePool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.submitted = []
+            pools.append(self)
+
+        def submit_listing(self, url, body, extractor=None):
+            self.submitted.append(extractor)
+            return super().submit_listing(url, body, extractor)
+
+    monkeypatch.setattr("scheduler.ParsePool", CountingPool)
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"), parse_workers=2)
+    counts = scraper.crawl_sites([server.url, SiteConfig(server.url + "page/1/", extractor="lxml")])
+
+    assert counts["inserted"] == 12
+    assert len(pools) == 1 and sorted(pools[0].submitted) == ["lxml"] * 3 + ["soup"] * 3
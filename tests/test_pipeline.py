@@ -0,0 +1,41 @@
+import pytest
+from unittest.mock import Mock, patch
+from oop_scraper import QuoteScraper, Quote
+from pipeline import batched, run_pipeline
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+def test_run_pipeline_sums_sink_counts():
+    sink = Mock(side_effect=lambda batch: {"inserted": len(batch)})
+
+    totals = run_pipeline(({"n": i} for i in range(12)), sink, batch_size=5)
+
+    assert totals == {"inserted": 12}
+    assert [len(call.args[0]) for call in sink.call_args_list] == [5, 5, 2]
+
+def test_run_pipeline_keeps_earlier_batches_when_source_fails():
+    def records():
+        for i in range(7):
+            yield {"n": i}
+        raise ConnectionError("crawl died")
+
+    stored = []
+    with pytest.raises(ConnectionError):
+        run_pipeline(records(), lambda batch: stored.extend(batch), batch_size=5)
+
+    assert len(stored) == 7
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_scraper_streams_batches_into_db(server, tmp_path, concurrent):
+    scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"))
+    store_records = Mock(wraps=scraper.store_records)
+
+    with patch.object(scraper, 'store_records', store_records):
+        counts = scraper.run_pipeline(concurrent=concurrent, batch_size=5)
+
+    assert counts == {"inserted": 12, "updated": 0, "unchanged": 0}
+    assert store_records.call_count == 3
+    session = scraper.Session()
+    assert session.query(Quote).count() == 12
+    session.close()
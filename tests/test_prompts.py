@@ -0,0 +1,64 @@
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from ai_recommender import dame_quotes
+from helpers import candidates
+from prompts import estimate_tokens, parse_ids, quote_line, serialize_quotes
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Love all, trust a few.") == 7
+    assert estimate_tokens("a" + " " * 40 + "b") == 12
+    assert estimate_tokens("internationalization") == 4
+
+
+def test_quote_line_is_one_line_without_separators():
+    record = {"text": 'Either | or\n"both"', "author": "Søren Kierkegaard", "tags": "choice,  life "}
+    assert quote_line(7, record) == '7|Søren Kierkegaard|choice,life|Either / or "both"'
+
+
+def test_serialize_respects_budget_and_order():
+    records = candidates(40).to_dict("records")
+    text, ids = serialize_quotes(records, 200)
+    assert ids == list(range(1, len(ids) + 1)) and 0 < len(ids) < len(records)
+    assert estimate_tokens(text) <= 200
+    assert text.splitlines()[0].startswith("1|Author 1|life,tag1|Quote 1:")
+
+
+def test_compact_prompt_is_smaller_than_to_string():
+    df = candidates(40)
+    before = estimate_tokens(df[["text", "tags", "author"]].to_string(index=False))
+    after = estimate_tokens(serialize_quotes(df.to_dict("records"), 10_000)[0])
+    # Mismas citas completas con menos de la mitad de tokens (sin relleno de espacios)
+    assert after < 0.5 * before
+
+
+def test_parse_ids():
+    assert parse_ids("3, 1, 99, 3, 2", [1, 2, 3], 2) == [3, 1]
+    assert parse_ids("Here are the quotes: none", [1, 2], 3) == []
+
+
+def test_dame_quotes_rebuilds_full_quotes_from_ids():
+    df = candidates(40)
+    selected = dame_quotes("citas sobre el valor", 2, df, llm=FakeListChatModel(responses=["9, 2"]))
+    assert selected["text"].tolist() == [df["text"][8], df["text"][1]]
+    # Texto completo, no recortado a 80 caracteres
+    assert len(selected["text"][0]) > 80
+
+
+def test_dame_quotes_prompt_stays_within_budget():
+    sent = {}
+
+    def fake_llm(prompt_value):
+        sent["prompt"] = "\n".join(message.content for message in prompt_value.to_messages())
+        return AIMessage(content="1")
+
+    dame_quotes("love", 3, candidates(200), token_budget=800, llm=RunnableLambda(fake_llm))
+    assert estimate_tokens(sent["prompt"]) <= 800
+    assert "1|Author 1|" in sent["prompt"]
+
+    with pytest.raises(ValueError):
+        dame_quotes("love", 3, candidates(), token_budget=50, llm=RunnableLambda(fake_llm))
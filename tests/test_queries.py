@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import event, text
+
+from helpers import record
+from oop_scraper import QuoteScraper, split_tags
+from queries import count_rows, db_version, fetch_page, quotes_by_author, quotes_by_tags, tag_counts
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"))
+    scraper.store_records([
+        record("Quote A", "Albert Einstein", "life, science"),
+        record("Quote B", "Albert Einstein", "life"),
+        record("Quote C", "Jane Austen", "love, life"),
+        record("Quote D", "Jane Austen", ""),
+    ])
+    return scraper
+
+
+def test_split_tags_normalizes_and_deduplicates():
+    assert split_tags(" Life, love ,life,, ") == ["life", "love"]
+    assert split_tags(None) == []
+
+
+def test_quotes_by_tags(scraper):
+    assert quotes_by_tags(scraper.engine, ["life"])["text"].tolist() == ["Quote A", "Quote B", "Quote C"]
+    assert quotes_by_tags(scraper.engine, "life, love", match_all=True)["text"].tolist() == ["Quote C"]
+    assert quotes_by_tags(scraper.engine, ["science", "love"])["text"].tolist() == ["Quote A", "Quote C"]
+    assert quotes_by_tags(scraper.engine, ["life"], limit=1, offset=1)["text"].tolist() == ["Quote B"]
+
+
+def test_quotes_by_author_and_tag_counts(scraper):
+    assert quotes_by_author(scraper.engine, "Jane Austen")["text"].tolist() == ["Quote C", "Quote D"]
+    counts = tag_counts(scraper.engine)
+    assert counts.values.tolist() == [["life", 3], ["love", 1], ["science", 1]]
+
+
+def test_upsert_replaces_quote_tags(scraper):
+    counts = scraper.store_records([record("Quote B", "Albert Einstein", "humor")])
+    assert counts["updated"] == 1
+    assert quotes_by_tags(scraper.engine, ["humor"])["text"].tolist() == ["Quote B"]
+    assert quotes_by_tags(scraper.engine, ["life"])["text"].tolist() == ["Quote A", "Quote C"]
+
+
+def test_fetch_page_keyset_projection_and_filters(scraper):
+    first = fetch_page(scraper.engine, columns=["text"], limit=2)
+    assert first.columns.tolist() == ["id", "text"]
+    assert first["text"].tolist() == ["Quote A", "Quote B"]
+
+    second = fetch_page(scraper.engine, columns=["text"], after_id=int(first["id"].iloc[-1]), limit=2)
+    assert second["text"].tolist() == ["Quote C", "Quote D"]
+
+    filtered = fetch_page(scraper.engine, author="Jane Austen", tag="life")
+    assert filtered[["text", "about_author"]].values.tolist() == [["Quote C", "Bio Jane Austen"]]
+    assert count_rows(scraper.engine) == 4
+    assert count_rows(scraper.engine, tag="life") == 3
+
+    with pytest.raises(ValueError):
+        fetch_page(scraper.engine, columns=["password"])
+
+
+def test_view_join_only_when_biography_is_requested(scraper):
+    statements = []
+
+    def record_sql(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(scraper.engine, "before_cursor_execute", record_sql)
+    fetch_page(scraper.engine, columns=["text", "author"], author="Jane Austen", tag="life")
+    count_rows(scraper.engine, author="Jane Austen")
+    assert not [statement for statement in statements if "quotes_flat" in statement]
+
+    fetch_page(scraper.engine, columns=["about_author"])
+    assert "quotes_flat" in statements[-1]
+    event.remove(scraper.engine, "before_cursor_execute", record_sql)
+
+
+def test_db_version_changes_on_write(scraper, tmp_path):
+    db_path = str(tmp_path / "quotes.db")
+    before = db_version(db_path)
+    scraper.store_records([record("Quote E", "Someone", "new")])
+    assert db_version(db_path) != before
+
+
+def test_tag_lookup_uses_index(scraper):
+    with scraper.engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT quote_id FROM quote_tags WHERE tag_id = 1")))
+    assert "ix_quote_tags_tag_id" in plan or "COVERING INDEX" in plan
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                 "tags VARCHAR(200), about_author TEXT)")
+    conn.execute("INSERT INTO quotes (text, author, tags, about_author) VALUES ('Old', 'Someone', 'life, hope', 'Bio')")
+    conn.commit()
+    conn.close()
+
+    scraper = QuoteScraper("http://localhost/", db_name=str(db_path))
+    assert tag_counts(scraper.engine)["tag"].tolist() == ["hope", "life"]
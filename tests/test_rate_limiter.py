@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+import requests
+from async_crawler import AsyncQuoteCrawler
+from oop_scraper import QuoteScraper
+from rate_limiter import HostLimiter, RateLimiter, RetryPolicy, parse_retry_after
+from fixture_server import FixtureServer, QuotesSite
+
+FAST_RETRIES = RetryPolicy(max_retries=3, backoff_base=0.01)
+
+def test_retry_policy_jittered_backoff():
+    policy = RetryPolicy(max_retries=2, backoff_base=0.5, backoff_max=1.5)
+
+    for attempt in range(5):
+        assert 0 <= policy.delay(attempt) <= min(1.5, 0.5 * 2 ** attempt)
+    assert policy.delay(0, retry_after=1.0) >= 1.0
+    assert policy.should_retry(503, 0)
+    assert policy.should_retry(None, 1)
+    assert not policy.should_retry(503, 2)
+    assert not policy.should_retry(404, 0)
+
+def test_token_bucket_spaces_requests():
+    host = HostLimiter(rate=10, burst=2)
+
+    waits = [host.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+def test_host_limiter_backs_off_and_ramps_up():
+    host = HostLimiter(rate=8, max_rate=10, concurrency=4)
+
+    host.on_response(503, 0.01)
+    assert host.rate == 4
+    assert host.concurrency == 2
+
+    for _ in range(10):
+        host.on_response(200, 0.01)
+    assert host.rate == 10
+    assert host.concurrency == 12
+
+def test_host_limiter_reacts_to_latency_spikes():
+    host = HostLimiter(rate=8, latency_floor=0.1)
+    host.on_response(200, 0.05)
+    rate = host.rate
+
+    host.on_response(200, 1.0)
+
+    assert host.rate == rate / 2
+    assert host.throttled == 1
+
+def test_async_conditions_do_not_outlive_their_event_loop():
+    limiter = RateLimiter(concurrency=1, max_concurrency=1, rate=1000, burst=1000)
+
+    async def crawl():
+        async def request(path):
+            async with limiter.acquire_async(f"http://example.com/{path}"):
+                await asyncio.sleep(0.001)
+        # Con concurrency=1 las peticiones esperan en la Condition del host
+        await asyncio.gather(*(request(i) for i in range(3)))
+
+    for _ in range(5):
+        asyncio.run(crawl())
+
+    assert len(limiter._conditions) <= 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_sync_crawl_retries_injected_errors(tmp_path):
+    faults = {"/page/2/": [503, 503], "/author/Author-1": [429]}
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5), faults=faults) as server:
+        limiter = RateLimiter()
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               rate_limiter=limiter, retry_policy=FAST_RETRIES)
+        df = scraper.scrape_quotes()
+
+        assert server.requests.count("/page/2/") == 3
+
+    assert len(df) == 12
+    assert list(limiter.stats().values())[0]["throttled"] == 3
+
+def test_async_crawl_retries_injected_errors():
+    faults = {"/page/3/": [500], "/author/Author-2": [503, 429]}
+    with FixtureServer(QuotesSite(pages=3, quotes_per_page=4, authors=5), faults=faults) as server:
+        df = AsyncQuoteCrawler(server.url, retry_policy=FAST_RETRIES).run()
+
+    assert len(df) == 12
+    assert (df["about_author"] == "Biography of Author 2.").sum() > 0
+
+def test_gives_up_after_max_retries(tmp_path):
+    faults = {"/": [503] * 5}
+    with FixtureServer(QuotesSite(pages=1), faults=faults) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               retry_policy=RetryPolicy(max_retries=2, backoff_base=0.01))
+        with pytest.raises(Exception):
+            scraper.scrape_quotes()
+
+        assert server.requests.count("/") == 3
+
+def test_client_errors_raise_without_retry(tmp_path):
+    with FixtureServer(QuotesSite(pages=2), faults={"/page/2/": [404]}) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"),
+                               retry_policy=RetryPolicy(max_retries=2, backoff_base=0.01))
+        with pytest.raises(requests.HTTPError) as excinfo:
+            scraper.scrape_quotes()
+
+        assert excinfo.value.response.status_code == 404
+        assert server.requests.count("/page/2/") == 1
+
+def test_read_timeout_is_retried(tmp_path):
+    with FixtureServer(QuotesSite(pages=1, quotes_per_page=1, authors=1), delay=0.3) as server:
+        scraper = QuoteScraper(server.url, db_name=str(tmp_path / "quotes.db"), timeout=(1, 0.1),
+                               retry_policy=RetryPolicy(max_retries=1, backoff_base=0.01))
+        with pytest.raises(Exception):
+            scraper.fetch_page(server.url)
+
+        assert server.requests.count("/") == 2
@@ -0,0 +1,101 @@
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import ai_recommender
+import response_cache
+from ai_recommender import dame_quotes
+from helpers import candidates
+from response_cache import ResponseCache, cache_key, normalize_query
+
+
+def counting_llm(answer="2, 1"):
+    calls = []
+
+    def fake_llm(prompt_value):
+        calls.append(prompt_value)
+        return AIMessage(content=answer)
+
+    return RunnableLambda(fake_llm), calls
+
+
+def test_normalized_key():
+    assert normalize_query("  Frases   MOTIVADORAS! ") == "frases motivadoras"
+    assert cache_key("Amor", 3, "m", "v1") == cache_key(" amor ", 3, "m", "v1")
+    assert cache_key("amor", 3, "m", "v1") != cache_key("amor", 4, "m", "v1")
+    assert cache_key("amor", 3, "m", "v1") != cache_key("amor", 3, "m", "v2")
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_sqlite_tier_and_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.db")
+
+    cache = ResponseCache(path, ttl=60)
+    cache.set("key", [{"text": "Love all", "author": "W"}])
+    cache.close()
+
+    # Otro proceso (memoria vacía) lee la respuesta de SQLite
+    reopened = ResponseCache(path, ttl=60)
+    assert reopened.get("key") == [{"text": "Love all", "author": "W"}]
+    now[0] += 61
+    assert reopened.get("key") is None
+    assert ResponseCache(path, ttl=60).get("key") is None
+
+
+def test_repeated_query_does_not_call_the_model():
+    llm, calls = counting_llm()
+    cache = ResponseCache()
+    first = dame_quotes("Frases de amor", 2, candidates(), llm=llm, cache=cache)
+    again = dame_quotes("  frases de AMOR ", 2, candidates(), llm=llm, cache=cache)
+    assert len(calls) == 1
+    assert again.equals(first)
+    assert first["author"].tolist() == ["Author 2", "Author 1"]
+
+    # Otro n u otras candidatas (el corpus ha cambiado) son otra consulta
+    dame_quotes("Frases de amor", 1, candidates(), llm=llm, cache=cache)
+    dame_quotes("Frases de amor", 2, candidates().iloc[::-1], llm=llm, cache=cache)
+    dame_quotes("Frases de amor", 2, candidates(), llm=llm, cache=cache, corpus_version="v2")
+    assert len(calls) == 4
+
+
+def test_empty_answers_are_not_cached():
+    llm, calls = counting_llm("I cannot help with that")
+    cache = ResponseCache()
+    assert dame_quotes("amor", 2, candidates(), llm=llm, cache=cache).empty
+    dame_quotes("amor", 2, candidates(), llm=llm, cache=cache)
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    created = []
+
+    def fake_chat_groq(**kwargs):
+        created.append(kwargs)
+        return FakeListChatModel(responses=["1"] * 10)
+
+    monkeypatch.setattr(ai_recommender, "ChatGroq", fake_chat_groq)
+    monkeypatch.setattr(ai_recommender, "_chain", None)
+    monkeypatch.setattr(ai_recommender, "_response_cache", ResponseCache())
+    return created
+
+
+def test_client_and_chain_are_created_once(fake_groq):
+    dame_quotes("amor", 1, candidates())
+    dame_quotes("valor", 1, candidates())
+    assert len(fake_groq) == 1
+    assert fake_groq[0]["temperature"] == 0 and fake_groq[0]["model"] == ai_recommender.MODEL
+    assert ai_recommender.get_chain() is ai_recommender.get_chain()
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import text
+
+from helpers import record
+from oop_scraper import QuoteScraper
+from queries import read_frame
+from retrieval import query_terms, shortlist_size, top_k_candidates
+from search import match_expression
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"))
+    records = [record(f"Filler quote number {i} about nothing in particular.", f"Author {i}", "misc")
+               for i in range(200)]
+    records += [
+        record("Love all, trust a few, do wrong to none.", "William Shakespeare", "love, trust"),
+        record("Where there is love there is life.", "Mahatma Gandhi", "love, life"),
+        record("Life is what happens while you are busy making other plans.", "John Lennon", "life"),
+    ]
+    scraper.store_records(records)
+    return scraper
+
+
+def test_query_terms_drop_stopwords():
+    assert query_terms("Quiero frases sobre el amor y la vida") == ["amor", "vida"]
+    assert query_terms("quotes about love and trust") == ["love", "trust"]
+    assert match_expression("love trust", mode="any") == '"love"* OR "trust"*'
+
+
+def test_shortlist_size():
+    assert shortlist_size(3) == 40
+    assert shortlist_size(20) == 100
+    assert shortlist_size(20, top_k=10) == 10
+
+
+def test_top_k_ranks_matching_quotes(scraper):
+    candidates = top_k_candidates(scraper.engine, "quotes about love and trust", k=10)
+    assert list(candidates.columns) == ["id", "text", "author", "tags", "score"]
+    # Ninguna cita de relleno: solo las que coinciden con algún término, la que coincide con más primero
+    assert candidates["author"].tolist() == ["William Shakespeare", "Mahatma Gandhi"]
+
+    candidates = top_k_candidates(scraper.engine, "life", k=1)
+    assert len(candidates) == 1
+
+
+def test_no_match_falls_back_to_first_rows(scraper):
+    candidates = top_k_candidates(scraper.engine, "melancolía", k=5)
+    assert len(candidates) == 5
+    assert candidates["score"].isna().all()
+
+
+def test_new_rows_are_candidates_without_rebuild(scraper):
+    scraper.store_records([record("Courage is grace under pressure.", "Ernest Hemingway", "courage")])
+    assert top_k_candidates(scraper.engine, "courage", k=5)["author"].tolist() == ["Ernest Hemingway"]
+
+
+def test_prompt_size_does_not_grow_with_table(scraper):
+    # Lo que dame_quotes serializa en el prompt: antes la tabla completa, ahora solo los candidatos
+    full = read_frame(scraper.engine, text("SELECT text, tags, author FROM quotes"))
+    candidates = top_k_candidates(scraper.engine, "love", k=shortlist_size(2))
+    assert len(candidates[["text", "tags", "author"]].to_string(index=False)) * 10 < len(full.to_string(index=False))
+
+    scraper.store_records([record(f"More filler {i}.", "Someone", "misc") for i in range(500)])
+    assert top_k_candidates(scraper.engine, "love", k=shortlist_size(2))["id"].tolist() == candidates["id"].tolist()
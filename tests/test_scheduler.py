@@ -0,0 +1,75 @@
+import asyncio
+import time
+from contextlib import ExitStack
+from oop_scraper import QuoteScraper, Quote
+from scheduler import CrawlScheduler, PrioritySlots, SiteConfig
+from fixture_server import FixtureServer, QuotesSite
+
+def test_priority_slots_interleave_hosts():
+    order = []
+
+    async def request(slots, host, priority=0):
+        async with slots.acquire(host, priority):
+            order.append(host)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        slots = PrioritySlots(1)
+        # "a" encola muchas peticiones primero; aun así "b" no espera a que terminen todas
+        tasks = [asyncio.create_task(request(slots, "a")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(request(slots, "b")) for _ in range(2)]
+        tasks += [asyncio.create_task(request(slots, "c", priority=-1))]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert order[0] == "a"
+    assert order[1] == "c"
+    assert order.index("b") < 4
+
+def test_scheduler_crawls_every_site_with_its_extractor():
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FixtureServer(QuotesSite(pages=2, quotes_per_page=3, authors=2)))
+                   for _ in range(3)]
+        sites = [SiteConfig(servers[0].url), SiteConfig(servers[1].url, extractor="lxml"),
+                 SiteConfig(servers[2].url, extractor="strainer")]
+        df = CrawlScheduler(sites).run()
+
+    assert len(df) == 18
+    assert sorted(df["site"].unique()) == sorted(server.url for server in servers)
+    assert (df.groupby("site").size() == 6).all()
+
+def test_slow_site_does_not_block_fast_sites():
+    with ExitStack() as stack:
+        slow = stack.enter_context(FixtureServer(QuotesSite(pages=3, quotes_per_page=2, authors=2), delay=0.2))
+        fast = [stack.enter_context(FixtureServer(QuotesSite(pages=3, quotes_per_page=2, authors=2)))
+                for _ in range(2)]
+
+        async def collect():
+            arrivals = {}
+            scheduler = CrawlScheduler([slow.url] + [server.url for server in fast], max_concurrency=4)
+            async for quote in scheduler.iter_quotes():
+                arrivals.setdefault(quote["site"], []).append(time.monotonic())
+            return arrivals
+
+        arrivals = asyncio.run(collect())
+
+    slow_done = max(arrivals[slow.url])
+    for server in fast:
+        assert len(arrivals[server.url]) == 6
+        assert max(arrivals[server.url]) < slow_done
+
+def test_crawl_sites_stores_all_sites(tmp_path):
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FixtureServer(QuotesSite(pages=2, quotes_per_page=2, authors=2)))
+                   for _ in range(2)]
+        servers[1].site.edit(1)
+        servers[1].site.edit(2)
+        scraper = QuoteScraper(servers[0].url, db_name=str(tmp_path / "quotes.db"))
+        counts = scraper.crawl_sites([server.url for server in servers], batch_size=3)
+
+    assert counts == {"inserted": 8, "updated": 0, "unchanged": 0}
+    session = scraper.Session()
+    assert session.query(Quote).count() == 8
+    session.close()
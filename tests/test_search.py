@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from helpers import record
+from oop_scraper import QuoteScraper
+from search import create_search_index, match_expression, search_quotes
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"))
+    scraper.store_records([
+        record("Imagination is more important than knowledge.", "Albert Einstein", "imagination, knowledge"),
+        record("Knowledge speaks, but wisdom listens.", "Jimi Hendrix", "wisdom"),
+        record("Life is what happens while you are busy making other plans.", "John Lennon", "life"),
+        record("La vida es sueño, y los sueños, sueños son.", "Calderón de la Barca", "vida"),
+    ])
+    return scraper
+
+
+def test_match_expression_quotes_user_input():
+    assert match_expression("life plans") == '"life" "plans"'
+    assert match_expression("imag", mode="prefix") == '"imag"*'
+    assert match_expression('busy "making', mode="phrase") == '"busy making"'
+    assert match_expression("  -- ") is None
+
+
+def test_search_ranks_by_bm25(scraper):
+    results = search_quotes(scraper.engine, "knowledge")
+    # La etiqueta suma relevancia a la cita de Einstein
+    assert results["author"].tolist() == ["Albert Einstein", "Jimi Hendrix"]
+    assert results["score"].is_monotonic_increasing
+
+
+def test_prefix_phrase_and_accents(scraper):
+    assert search_quotes(scraper.engine, "imag", mode="prefix")["author"].tolist() == ["Albert Einstein"]
+    assert search_quotes(scraper.engine, "busy making", mode="phrase")["author"].tolist() == ["John Lennon"]
+    assert search_quotes(scraper.engine, "making busy", mode="phrase").empty
+    assert search_quotes(scraper.engine, "suenos calderon")["author"].tolist() == ["Calderón de la Barca"]
+    assert search_quotes(scraper.engine, "-- ()").empty
+
+
+def test_index_follows_upserts(scraper):
+    scraper.store_records([record("Life is what happens while you are busy making other plans.", "John Lennon",
+                                  "life, humor")])
+    assert search_quotes(scraper.engine, "humor")["author"].tolist() == ["John Lennon"]
+
+    with scraper.engine.begin() as conn:
+        conn.execute(text("DELETE FROM quotes WHERE author = 'Jimi Hendrix'"))
+    assert search_quotes(scraper.engine, "wisdom").empty
+
+
+def test_existing_database_is_indexed(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author VARCHAR(100), "
+                 "tags VARCHAR(200), about_author TEXT)")
+    conn.execute("INSERT INTO quotes (text, author, tags, about_author) VALUES ('Old wisdom', 'Someone', 'life', '')")
+    conn.commit()
+    conn.close()
+
+    scraper = QuoteScraper("http://localhost/", db_name=str(db_path))
+    assert search_quotes(scraper.engine, "wisdom")["author"].tolist() == ["Someone"]
+    assert create_search_index(scraper.engine) == []
+
+    # Filas añadidas por otro escritor sin indexar: se recuperan al volver a abrir la BBDD
+    with scraper.engine.begin() as conn:
+        conn.execute(text("INSERT INTO quotes (text, author, tags) VALUES ('Late wisdom', 'Other', '')"))
+    assert search_quotes(scraper.engine, "late").empty
+    create_search_index(scraper.engine)
+    assert search_quotes(scraper.engine, "late")["author"].tolist() == ["Other"]
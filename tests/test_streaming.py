@@ -0,0 +1,71 @@
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import RunnableGenerator
+
+from ai_recommender import dame_quotes, stream_quotes
+from helpers import candidates
+from prompts import IdStreamParser
+from response_cache import ResponseCache
+
+
+def chunked_model(pieces, events):
+    # Modelo de chat falso que emite la respuesta en los trozos indicados y anota cuándo lo hace
+    def stream(inputs):
+        for _ in inputs:
+            pass
+        for piece in pieces:
+            events.append(("chunk", piece))
+            yield AIMessageChunk(content=piece)
+
+    return RunnableGenerator(stream)
+
+
+def test_parser_completes_ids_across_chunks():
+    parser = IdStreamParser(range(1, 13), n=3)
+    assert parser.feed("1") == []
+    assert parser.feed("2, 9") == [12]
+    assert parser.feed("9, 3") == []  # 99 no es una candidata
+    assert parser.close() == [3]
+    assert parser.selected == [12, 3]
+
+    parser = IdStreamParser(range(1, 13), n=1)
+    assert parser.feed("5, 6, 7") == [5] and parser.done
+
+
+def test_quotes_are_yielded_before_the_answer_ends():
+    events = []
+    llm = chunked_model(["3", ", 1", "1, ", "2"], events)
+    for quote in stream_quotes("amor", 3, candidates(), llm=llm, cache=ResponseCache()):
+        events.append(("quote", quote["author"]))
+    assert events == [
+        ("chunk", "3"), ("chunk", ", 1"), ("quote", "Author 3"),
+        ("chunk", "1, "), ("quote", "Author 11"),
+        ("chunk", "2"), ("quote", "Author 2"),
+    ]
+
+
+def test_stream_stops_after_n_quotes():
+    events = []
+    llm = chunked_model(["4, ", "5, ", "6"], events)
+    quotes = list(stream_quotes("amor", 1, candidates(), llm=llm, cache=ResponseCache()))
+    assert [quote["author"] for quote in quotes] == ["Author 4"]
+    assert ("chunk", "6") not in events
+
+
+def test_generic_fake_streaming_model_and_cache():
+    cache = ResponseCache()
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="7, 2, 9")]))
+    quotes = list(stream_quotes("valor", 2, candidates(), llm=llm, cache=cache))
+    assert quotes == candidates().iloc[[6, 1]].to_dict("records")
+    # Segunda vez: de la caché, sin volver a llamar al modelo (ya no le quedan respuestas)
+    assert list(stream_quotes("Valor", 2, candidates(), llm=llm, cache=cache)) == quotes
+    assert dame_quotes("valor", 2, candidates(), llm=llm, cache=cache)["author"].tolist() == ["Author 7", "Author 2"]
+
+
+def test_abandoned_stream_is_not_cached():
+    cache = ResponseCache()
+    events = []
+    stream = stream_quotes("amor", 3, candidates(), llm=chunked_model(["1, ", "2, ", "3"], events), cache=cache)
+    next(stream)
+    stream.close()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+import pytest
+
+from helpers import record
+from oop_scraper import QuoteScraper
+from retrieval import top_k_candidates
+from vectors import HashingEmbedder, LsaEmbedder, VectorIndex, normalize_text
+
+
+FILLER = [record(f"Filler quote number {i} about cooking and the weather.", f"Author {i}", "misc") for i in range(300)]
+THEMED = [
+    record("There is a sweet melancholy in autumn evenings.", "Someone", "sadness, melancholy"),
+    record("Happiness is a warm puppy.", "Charles M. Schulz", "happiness"),
+]
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    index = VectorIndex(str(tmp_path / "vectors"))
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"), vector_index=index)
+    scraper.store_records(FILLER + THEMED)
+    return scraper
+
+
+def test_hashing_embedder_is_stable_and_normalized():
+    vectors = HashingEmbedder(dim=64).embed(["Melancólico", "melancolico", ""])
+    assert vectors.shape == (3, 64) and vectors.dtype == np.float32
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0) and not vectors[2].any()
+    assert normalize_text("Él") == "el"
+
+
+def test_store_records_updates_index_incrementally(scraper):
+    index = scraper.vector_index
+    assert len(index) == 302 and index.last_id == 302
+
+    scraper.store_records([record("Courage is grace under pressure.", "Ernest Hemingway", "courage")])
+    assert len(index) == 303
+    # Otra instancia (otro proceso) ve los mismos vectores sin reconstruir
+    reopened = VectorIndex(index.directory)
+    assert len(reopened) == 303
+    assert reopened.sync(scraper.engine) == 0
+    assert reopened.query("courage", k=1)[0][0] == 303
+
+
+def test_spanish_query_matches_english_quote_by_shared_ngrams(scraper):
+    # Sin palabras en común con la cita: BM25 no la encuentra, los n-gramas de "melancól-"/"melanchol-" sí
+    index = scraper.vector_index
+    assert index.query("frases melancólicas", k=1)[0][0] == 301
+    candidates = top_k_candidates(scraper.engine, "frases melancólicas", k=5, vector_index=index)
+    assert candidates["author"].iloc[0] == "Someone"
+    assert candidates["score"].is_monotonic_increasing
+
+
+def test_lsa_matches_terms_that_only_co_occur(tmp_path):
+    # "grief" y la cita no comparten ningún n-grama: solo LSA las relaciona, porque "grief" y "sorrow"
+    # aparecen juntas en el corpus
+    rng = random.Random(0)
+    words = "kitchen recipe weather rain garden bread coffee market river train window morning".split()
+    filler = [record(" ".join(rng.sample(words, 4)), f"Author {i}", "misc") for i in range(200)]
+    paired = [record(f"Grief and sorrow by the {rng.choice(words)}.", f"Writer {i}", "") for i in range(40)]
+    target = record("Sorrow is the price we pay for love.", "Someone", "")
+    index = VectorIndex(str(tmp_path / "vectors"), embedder=LsaEmbedder(components=8))
+    scraper = QuoteScraper("http://localhost/", db_name=str(tmp_path / "quotes.db"), vector_index=index)
+    scraper.store_records(filler + paired + [target])
+
+    hashing = HashingEmbedder(dim=2048).embed(["grief", target["text"]])
+    assert hashing[0] @ hashing[1] == 0
+    scores = dict(index.query("grief", k=len(index)))
+    assert scores[241] > 0.5 > max(scores[quote_id] for quote_id in range(1, 201))
+
+
+def test_updated_quote_is_reembedded(scraper):
+    index = scraper.vector_index
+    assert index.query("puppy happiness", k=1)[0][0] == 302
+
+    counts = scraper.store_records([record("Happiness is a warm puppy.", "Charles M. Schulz", "dogs, kittens")])
+
+    assert counts["updated"] == 1 and len(index) == 302
+    assert index.query("kittens", k=1)[0][0] == 302
+    assert VectorIndex(index.directory).query("kittens", k=1)[0][0] == 302
+
+
+def test_concurrent_sync_and_search(scraper):
+    from concurrent.futures import ThreadPoolExecutor
+
+    index = scraper.vector_index
+    new = [record(f"Concurrent quote {i} about patience.", f"Writer {i}", "patience") for i in range(2000)]
+
+    def search():
+        for _ in range(20):
+            ids, _ = index.search(["patience"], k=5)
+            assert (ids > 0).all()
+
+    with ThreadPoolExecutor(4) as pool:
+        searches = [pool.submit(search) for _ in range(3)]
+        pool.submit(scraper.store_records, new).result()
+        for future in searches:
+            future.result()
+    assert len(index) == 2302 and index.meta["capacity"] >= 2302
+
+
+def test_batched_search_matches_single_queries(scraper):
+    index = scraper.vector_index
+    ids, scores = index.search(["melancholy", "happiness", "weather"], k=3, block_rows=64)
+    assert ids.shape == scores.shape == (3, 3)
+    for row, query in enumerate(["melancholy", "happiness", "weather"]):
+        assert ids[row].tolist() == [quote_id for quote_id, _ in index.query(query, k=3)]
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_clusters_keep_results(scraper):
+    index = scraper.vector_index
+    exact = index.search(["happiness puppy", "melancholy"], k=1)[0]
+    index.build_clusters(nlist=8)
+    index.nprobe = 2
+    assert (index.search(["happiness puppy", "melancholy"], k=1)[0] == exact).all()
+    # Las filas nuevas se asignan a su cluster al añadirlas
+    scraper.store_records([record("Joy is the simplest form of gratitude.", "Karl Barth", "joy")])
+    assert index.query("simplest gratitude", k=1)[0][0] == 303
+    assert VectorIndex(index.directory, nprobe=2).centroids.shape == (8, 256)
+
+
+def test_changing_embedder_rebuilds(scraper):
+    lsa = VectorIndex(scraper.vector_index.directory, embedder=LsaEmbedder(components=16))
+    assert len(lsa) == 0
+    assert lsa.sync(scraper.engine) == 302
+    assert lsa.meta["dim"] == 16
+    # La proyección LSA se guarda con el índice y se reutiliza al reabrirlo
+    reopened = VectorIndex(scraper.vector_index.directory, embedder=LsaEmbedder(components=16))
+    assert len(reopened) == 302